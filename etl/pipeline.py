@@ -1,10 +1,14 @@
-import json
 import logging
 import os
+import threading
 import time
-from typing import Dict, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, List, Set, Union
 
+import orjson
 import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from models import (
@@ -18,58 +22,275 @@ from models import (
     Product,
     Stage,
 )
-from utils.db import db_session
-from utils.etl import clean_text
+from models.company import convert_countries
+from models.validators import (
+    validate_companies_batch,
+    validate_contacts_batch,
+    validate_opportunities_batch,
+)
+from utils.db import db_session, engine, insert_ignore_conflicts, select_where_in
+from utils.etl import (
+    clean_text_column,
+    frozen_now,
+    iter_records,
+    parse_datetime_columns,
+    read_csv_chunks,
+    read_json_chunks,
+    strip_text_column,
+    title_text_column,
+    utc_now,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+MIN_TIMESTAMP = pd.Timestamp.min.tz_localize("UTC")
+
+# Columns of the NDJSON files, the keys missing from a whole chunk are added
+CONTACT_COLUMNS = (
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "title",
+    "company_id",
+    "phone",
+    "status",
+    "created_date",
+    "last_modified",
+)
+ACTIVITY_COLUMNS = (
+    "id",
+    "contact_id",
+    "opportunity_id",
+    "type",
+    "subject",
+    "timestamp",
+    "duration_minutes",
+    "outcome",
+)
+
 
 class Pipeline:
 
-    # chunk size for reading large CSV files
+    # chunk size for reading large CSV / NDJSON files
     chunk_size = 50000
-
-    validation_errors = {
-        "companies": [],
-        "contacts": [],
-        "opportunities": [],
-        "activities": [],
-    }
+    # number of chunks processed concurrently, each on its own database session
+    # (their inserts and commits are serialized on SQLite, see `_write_lock`)
+    max_workers = 8
+    # number of records per INSERT statement, all of a chunk's
+    # statements run in the same transaction
+    insert_batch_size = 1000
 
     def __init__(self, path, errors_path):
         self.data_path = path
         self.errors_path = errors_path
 
+        self.companies_file_path = os.path.join(path, "companies.csv")
+        self.contacts_file_path = os.path.join(path, "contacts.json")
+        self.opportunities_file_path = os.path.join(path, "opportunities.csv")
+        self.activities_file_path = os.path.join(path, "activities.json")
+
+        # NDJSON file of the current run's validation errors, created on
+        # the first error so runs without errors don't leave empty files
+        self.errors_file_path = None
+        self._errors_file = None
+        self._errors_file_lock = threading.Lock()
+
+        # `sub_entity_class` -> {name: id} maps shared by all the chunks of a run
+        self._sub_entity_caches: Dict[type, Dict[str, int]] = {}
+        self._sub_entity_caches_lock = threading.Lock()
+
+        # SQLite allows a single writer at a time, concurrent chunks take turns
+        # to insert and commit instead of failing with "database is locked"
+        if engine.dialect.name == "sqlite":
+            self._write_lock = threading.Lock()
+        else:
+            self._write_lock = nullcontext()
+
+        # "Now" snapshot of the current run, dates of all its records
+        # are validated against it (see `frozen_now`)
+        self._now = None
+
     def run(self):
-        with db_session() as session:
-            self.process_companies(session)
-            self.process_contacts(session)
-            self.process_opportunities(session)
-            self.process_activities(session)
-
-        # log errors to a json file
-        if any(len(errors) > 0 for errors in self.validation_errors.values()):
-            self.log_errors()
+        # Sub-entities could have been changed in the database between runs
+        self.load_sub_entities()
+        # Only the errors of the current run are reported
+        self.errors_file_path = None
+        self._now = utc_now()
+
+        try:
+            # Entities are processed in order of their foreign keys dependencies
+            self.process_companies()
+            self.process_contacts()
+            self.process_opportunities()
+            self.process_activities()
+        finally:
+            if self._errors_file is not None:
+                self._errors_file.close()
+                self._errors_file = None
+
+        if self.errors_file_path is not None:
             logger.info(
                 "\n ETL Pipeline has been successfully completed."
-                f"\n There were validation errors. Please check them out at: {self.errors_path}"
+                f"\n There were validation errors. Please check them out at: {self.errors_file_path}"
             )
         else:
             logger.info("\n ETL Pipeline has been successfully completed.")
 
-    def log_errors(self):
+    def load_sub_entities(self):
+        """
+        Loads the `{name: id}` maps of all the sub-entities (i.e. lookup tables)
+        in a single query each, so chunks only hit the database for new names.
+        """
+        self._sub_entity_caches.clear()
+        with db_session() as session:
+            for sub_entity_class in (
+                Industry,
+                ContactStatus,
+                Stage,
+                ForecastCategory,
+                Product,
+            ):
+                self._sub_entity_caches[sub_entity_class] = dict(
+                    session.execute(
+                        select(sub_entity_class.name, sub_entity_class.id)
+                    ).all()
+                )
+
+    def log_validation_error(self, entity: str, record: dict, errors: List[str]):
+        """
+        Appends a validation error to the NDJSON errors file of the current run.
+
+        Args:
+            entity (str): Name of the invalid record's entity (e.g. `companies`).
+            record (dict): The invalid record.
+            errors (list): Validation errors of the record.
+        """
+        line = orjson.dumps(
+            {"entity": entity, "record": record, "errors": errors},
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+        # Chunks are processed concurrently, lines are written one at a time
+        with self._errors_file_lock:
+            if self._errors_file is None:
+                os.makedirs(self.errors_path, exist_ok=True)
+                self.errors_file_path = os.path.join(
+                    self.errors_path, f"{time.time()}-pipeline-errors.jsonl"
+                )
+                self._errors_file = open(self.errors_file_path, "wb")
+            self._errors_file.write(line)
+
+    def process_chunks(
+        self, process_chunk: Callable[[pd.DataFrame], None], chunks: Iterable
+    ):
+        """
+        Processes the chunks concurrently in a pool of `max_workers` threads.
+
+        Chunks are read on the calling thread, at most `max_workers` of them
+        are being processed at once to bound memory usage.
+
+        Args:
+            process_chunk (callable): Function processing a single chunk.
+            chunks (Iterable): DataFrame chunks to be processed.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(process_chunk, chunk))
+
+            for future in pending:
+                future.result()
+
+    def insert_records(
+        self,
+        session: Session,
+        entity: str,
+        model: type,
+        records: List[dict],
+        raw_records: List[dict],
+    ):
+        """
+        Bulk inserts the records in batches of `insert_batch_size` records,
+        then commits them.
+
+        Records conflicting with existing ones on a unique column (e.g. inserted
+        meanwhile by another chunk) are skipped by the database. When the backend
+        supports `INSERT ... RETURNING`, they are logged as validation errors.
+
+        Args:
+            session (Session): SQLAlchemy database session.
+            entity (str): Name of the records' entity (e.g. `companies`).
+            model (class): SQLAlchemy model class of the records.
+            records (list): Records to be inserted, as dicts of column values.
+            raw_records (list): The records as read, reported if skipped.
         """
-        Writes the validation errors to a JSON file.
+        statement = insert_ignore_conflicts(session, model)
+        if not session.get_bind().dialect.insert_executemany_returning:
+            with self._write_lock:
+                for start in range(0, len(records), self.insert_batch_size):
+                    session.execute(
+                        statement, records[start : start + self.insert_batch_size]
+                    )
+                session.commit()
+            return
+
+        inserted_ids = set()
+        with self._write_lock:
+            for start in range(0, len(records), self.insert_batch_size):
+                inserted_ids.update(
+                    session.execute(
+                        statement.returning(model.id),
+                        records[start : start + self.insert_batch_size],
+                    ).scalars()
+                )
+            session.commit()
+
+        if len(inserted_ids) == len(records):
+            return
+
+        unique_columns = ", ".join(
+            column.name
+            for column in model.__table__.columns
+            if column.primary_key or column.unique
+        )
+        for record, raw_record in zip(records, raw_records):
+            if record["id"] not in inserted_ids:
+                self.log_validation_error(
+                    entity,
+                    raw_record,
+                    [f"{unique_columns}: Conflicts with an existing record."],
+                )
+
+    def get_new_records_mask(
+        self, session: Session, model: type, records: pd.DataFrame
+    ) -> pd.Series:
+        """
+        Returns a boolean mask selecting the records to be processed: the last
+        record of each ID, unless the ID already exists in the database.
+
+        Args:
+            session (Session): SQLAlchemy database session.
+            model (class): SQLAlchemy model class of the records.
+            records (DataFrame): Pandas DataFrame containing the records.
+
+        Returns:
+            Series: The boolean mask, aligned on the records' index.
         """
-        errors_file_path = os.path.join(
-            self.errors_path, f"{time.time()}-pipeline-errors.json"
+        existing_ids = {
+            record_id
+            for (record_id,) in select_where_in(
+                session, [model.id], model.id, records["id"].unique().tolist()
+            )
+        }
+        return ~records["id"].isin(existing_ids) & ~records.duplicated(
+            subset="id", keep="last"
         )
-        if self.validation_errors:
-            # Write the updated errors back to the file
-            os.makedirs(self.errors_path, exist_ok=True)
-            with open(errors_file_path, "w") as f:
-                json.dump(self.validation_errors, f, indent=4)
 
     def process_sub_entities(
         self,
@@ -85,195 +306,284 @@ class Pipeline:
 
         This method:
         1. Extracts unique `entity_column` values from the provided entities dataset.
-        2. Retrieves existing `sub_entity_class` instances from the database given above extracted values.
-        3. Inserts new `sub_entity_class` instances that do not already exist.
-        4. Returns a mapping: `sub_entity_class.name` to `sub_entity_class.id`.
+        2. Skips the values already cached during the current pipeline run
+           (see `load_sub_entities`).
+        3. Inserts `sub_entity_class` instances for the remaining values, skipping
+           the ones that already exist in the database.
+        4. Caches and returns a copy of the mapping: `sub_entity_class.name`
+           to `sub_entity_class.id`.
 
         Args:
             session (Session): SQLAlchemy database session.
             sub_entity_class (class): SQLAlchemy model class.
             entities (DataFrame): Pandas DataFrame containing entities
-            with `entity_column` column.
+            with already cleaned `entity_column` column.
             entity_column (str): The column name in the entities DataFrame.
 
         Returns:
             dict: A mapping of `sub_entity_class`'s names to their corresponding database IDs.
         """
-        # Clean up to get unique `entity_column` values
-        unique_sub_entity_values = entities[entity_column].apply(clean_text).unique()
-
-        # Retrieve existing `sub_entity_class` instances from database
-        name_col = getattr(sub_entity_class, "name")
-        id_col = getattr(sub_entity_class, "id")
-        existing_sub_entities = session.query(id_col, name_col).filter(
-            name_col.in_(unique_sub_entity_values)
-        )
-
-        # Bulk insert new `sub_entity_class` instances
-        new_sub_entities = set(unique_sub_entity_values) - set(
-            [industry.name for industry in existing_sub_entities.all()]
-        )
-        session.bulk_save_objects(
-            [sub_entity_class(name=name) for name in new_sub_entities]
-        )
-        session.commit()
+        # Chunks are processed concurrently, sub-entities are created by
+        # one of them at a time to keep the cache consistent
+        with self._sub_entity_caches_lock:
+            sub_entities_map = self._sub_entity_caches.setdefault(sub_entity_class, {})
+
+            # Get unique `entity_column` values not seen yet
+            unique_sub_entity_values = pd.unique(entities[entity_column].values)
+            new_sub_entity_values = [
+                name
+                for name in unique_sub_entity_values
+                if name not in sub_entities_map
+            ]
+            # Copies are returned, the cache is updated by the other chunks
+            # while the caller reads the map
+            if not new_sub_entity_values:
+                return dict(sub_entities_map)
+
+            # Bulk insert `sub_entity_class` instances, existing names are skipped
+            # by the database's unique constraint on `name`
+            with self._write_lock:
+                session.execute(
+                    insert_ignore_conflicts(session, sub_entity_class),
+                    [{"name": name} for name in new_sub_entity_values],
+                )
+                session.commit()
+
+            # Retrieve the IDs of the new names, created or already existing
+            name_col = getattr(sub_entity_class, "name")
+            id_col = getattr(sub_entity_class, "id")
+            sub_entities_map.update(
+                select_where_in(
+                    session, [name_col, id_col], name_col, new_sub_entity_values
+                )
+            )
 
-        # Return `sub_entity_class` instances map to be used
-        # during the ETL processing
-        return {
-            sub_entity.name: sub_entity.id for sub_entity in existing_sub_entities.all()
-        }
+            # Return `sub_entity_class` instances map to be used
+            # during the ETL processing
+            return dict(sub_entities_map)
 
-    def process_companies(self, session: Session):
+    def process_companies(self):
         """
         Processes and inserts company data into the database.
 
         This method:
-        1. Reads company data from a CSV file.
+        1. Reads company data from a CSV file in chunks.
         2. Processes and maps industries to their corresponding IDs.
-        3. Identifies new companies that are not already in the database.
-        4. Cleans, validates, and prepares new companies for insertion.
-        5. Performs a bulk insert of new companies.
+        3. Cleans, validates, and prepares companies for insertion.
+        4. Performs a bulk insert of companies, skipping the ones that
+           already exist in the database.
 
-        Args:
-            session (Session): SQLAlchemy database session.
+        Chunks are processed concurrently, see `process_chunks`.
         """
-        companies_df_chunk_iter = pd.read_csv(
-            os.path.join(self.data_path, "companies.csv"), chunksize=self.chunk_size
+        companies_df_chunk_iter = read_csv_chunks(
+            self.companies_file_path,
+            self.chunk_size,
+            string_columns=("created_date",),
         )
-        for companies_df in companies_df_chunk_iter:
+        self.process_chunks(self._process_companies_chunk, companies_df_chunk_iter)
+
+    def _process_companies_chunk(self, companies_df: pd.DataFrame):
+        with db_session() as session, frozen_now(self._now):
+            companies_df["industry"] = clean_text_column(companies_df["industry"])
+
             # Process industries data first
             industry_ids_map = self.process_sub_entities(
                 session, Industry, companies_df, "industry"
             )
 
-            # Convert company data into a dictionary with company ID as key
-            companies_map = {
-                company["id"]: company
-                for company in companies_df.to_dict(orient="records")
-            }
-
-            # Identify existing companies
-            company_ids = list(companies_map.keys())
-            existing_companies = session.query(Company.id).filter(
-                Company.id.in_(company_ids)
+            # Replace industry names with industry IDs (foreign key)
+            companies_df["industry_id"] = (
+                companies_df.pop("industry").map(industry_ids_map).astype("Int64")
             )
 
-            # Determine which companies are new
-            new_company_ids = set(company_ids) - set(
-                [company.id for company in existing_companies.all()]
+            # Only new companies are validated and inserted
+            companies_df = companies_df[
+                self.get_new_records_mask(session, Company, companies_df)
+            ]
+            if companies_df.empty:
+                return
+
+            # Convert all the countries of the chunk at once, so validating
+            # each company only hits the country codes cache
+            convert_countries(companies_df["country"].dropna().unique())
+
+            # Validate domains of the whole chunk at once
+            cleaned_companies, companies_errors = validate_companies_batch(
+                session, companies_df
+            )
+            # Parse dates of the whole chunk at once
+            cleaned_companies = cleaned_companies.join(
+                parse_datetime_columns(companies_df, ("created_date",))
             )
+            # Standardize text of the whole chunk at once
+            cleaned_companies["name"] = clean_text_column(companies_df["name"])
 
-            # Clean and validate new companies
+            # Clean and validate companies
             to_create = []
-            for company_id in new_company_ids:
-                # Replace industry name with industry ID (foreign key)
-                company_data = companies_map[company_id]
-                company_data["industry_id"] = industry_ids_map[
-                    clean_text(company_data.pop("industry"))
-                ]
-                company = Company(**company_data)
+            to_create_data = []
+            for company_data, cleaned_company_data, errors in zip(
+                iter_records(companies_df),
+                iter_records(cleaned_companies),
+                companies_errors,
+            ):
+                company = Company(**{**company_data, **cleaned_company_data})
 
                 # Validate company data before insertion
-                is_valid = company.validate()
-                if not is_valid:
-                    self.validation_errors["companies"].append(
-                        {"record": company_data, "errors": company.validation_errors}
-                    )
+                errors += company.validate()
+                if errors:
+                    self.log_validation_error("companies", company_data, errors)
                     continue
 
-                to_create.append(company)
+                to_create.append(company.as_dict())
+                to_create_data.append(company_data)
 
-            # Bulk insert new companies
-            session.bulk_save_objects(to_create)
-            session.commit()
+            # Bulk insert companies, conflicting ones are skipped and reported
+            self.insert_records(
+                session, "companies", Company, to_create, to_create_data
+            )
 
-    def process_contacts(self, session: Session):
+    def process_contacts(self):
         """
         Processes and inserts contact data into the database.
 
         This method:
-        1. Reads contact data from a CSV file.
-        2. Identifies new contacts that are not already in the database.
-        3. Cleans, validates, and prepares new contacts for insertion.
-        4. Performs a bulk insert of new contacts.
+        1. Reads contact data from a NDJSON file in chunks.
+        2. Cleans, validates, and prepares contacts for insertion.
+        3. Performs a bulk insert of contacts, skipping the ones that
+           already exist in the database.
 
-        Args:
-            session (Session): SQLAlchemy database session.
+        Chunks are processed concurrently, see `process_chunks`.
         """
-        # Read contacts data from a JSON file
-
-        # NOTE: `chunksize` cannot be used because JSONReader requires file to
-        # be in NDJSON format (i.e. newline-delimited JSON). This can be addressed
-        # in data generation script.
-
-        contacts = pd.read_json(os.path.join(self.data_path, "contacts.json"))
-        # Sorting contacts by last_modified date and removing duplicates
-        # by keeping first record since it will be newest
-        contacts.sort_values(by="last_modified", ascending=False, inplace=True)
-        contacts.drop_duplicates(subset="email", inplace=True, keep="first")
+        # Removing duplicated emails by keeping the newest contact (by
+        # `last_modified`) of each email across all the chunks
+        latest_contact_ids = self._get_latest_contact_ids(self.contacts_file_path)
 
-        contact_statuses_map = self.process_sub_entities(
-            session, ContactStatus, contacts, "status"
+        self.process_chunks(
+            lambda contacts: self._process_contacts_chunk(contacts, latest_contact_ids),
+            read_json_chunks(self.contacts_file_path, self.chunk_size, CONTACT_COLUMNS),
         )
 
-        # Convert contact data into a dictionary with contact ID as key
-        contacts_map = {
-            contact["id"]: contact for contact in contacts.to_dict(orient="records")
-        }
-
-        # Identify existing contacts
-        contact_ids = list(contacts_map.keys())
-        existing_contacts = session.query(Contact.id).filter(
-            Contact.id.in_(contact_ids)
-        )
+    def _process_contacts_chunk(
+        self, contacts: pd.DataFrame, latest_contact_ids: Set[str]
+    ):
+        contacts["status"] = clean_text_column(contacts["status"])
+        is_latest_contact = contacts["id"].isin(latest_contact_ids)
+        if not is_latest_contact.any():
+            return
+
+        with db_session() as session, frozen_now(self._now):
+            contact_statuses_map = self.process_sub_entities(
+                session, ContactStatus, contacts[is_latest_contact], "status"
+            )
 
-        # Determine which contacts are new
-        new_contact_ids = set(contact_ids) - set(
-            [contact.id for contact in existing_contacts.all()]
-        )
+            # Replace status names with status IDs (foreign key)
+            contacts["status_id"] = (
+                contacts.pop("status").map(contact_statuses_map).astype("Int64")
+            )
 
-        # Clean and validate new contacts
-        to_create = []
-        for contact_id in new_contact_ids:
-            contact_data = contacts_map[contact_id]
-            contact_data["status_id"] = contact_statuses_map[
-                clean_text(contact_data.pop("status"))
+            # Only new contacts are validated and inserted
+            contacts = contacts[
+                is_latest_contact
+                & self.get_new_records_mask(session, Contact, contacts)
             ]
+            if contacts.empty:
+                return
 
-            contact = Contact(**contact_data)
+            # Validate emails and phone numbers of the whole chunk at once
+            cleaned_contacts, contacts_errors = validate_contacts_batch(
+                session, contacts
+            )
+            # Parse dates of the whole chunk at once
+            cleaned_contacts = cleaned_contacts.join(
+                parse_datetime_columns(contacts, ("created_date", "last_modified"))
+            )
+            # Standardize text of the whole chunk at once
+            cleaned_contacts["first_name"] = title_text_column(contacts["first_name"])
+            cleaned_contacts["last_name"] = title_text_column(contacts["last_name"])
+            cleaned_contacts["title"] = strip_text_column(contacts["title"])
 
-            # Validate contact data before insertion
-            is_valid = contact.validate()
-            if not is_valid:
-                self.validation_errors["contacts"].append(
-                    {"record": contact_data, "errors": contact.validation_errors}
-                )
-                continue
+            # Clean and validate contacts
+            to_create = []
+            to_create_data = []
+            for contact_data, cleaned_contact_data, errors in zip(
+                iter_records(contacts),
+                iter_records(cleaned_contacts),
+                contacts_errors,
+            ):
+                contact = Contact(**{**contact_data, **cleaned_contact_data})
+
+                # Validate contact data before insertion
+                errors += contact.validate()
+                if errors:
+                    self.log_validation_error("contacts", contact_data, errors)
+                    continue
 
-            to_create.append(contact)
+                to_create.append(contact.as_dict())
+                to_create_data.append(contact_data)
 
-        # Bulk insert new contacts
-        session.bulk_save_objects(to_create)
-        session.commit()
+            # Bulk insert contacts, conflicting ones are skipped and reported
+            self.insert_records(session, "contacts", Contact, to_create, to_create_data)
 
-    def process_opportunities(self, session: Session):
+    def _get_latest_contact_ids(self, contacts_file_path: str) -> Set[str]:
+        """
+        Returns IDs of the newest contact (by `last_modified`) for each email.
+
+        Contacts are read in chunks and reduced into an email -> (id, last_modified)
+        map, so memory grows with the number of unique emails only.
+        """
+        latest_contacts = {}
+        for contacts in read_json_chunks(
+            contacts_file_path, self.chunk_size, CONTACT_COLUMNS
+        ):
+            # Unparsable dates are considered the oldest ones
+            last_modified = pd.to_datetime(
+                contacts["last_modified"], utc=True, errors="coerce", format="ISO8601"
+            ).fillna(MIN_TIMESTAMP)
+
+            # Newest contact of each email within the chunk
+            latest_positions = last_modified.groupby(
+                contacts["email"], sort=False, dropna=False
+            ).idxmax()
+            contacts = contacts.loc[latest_positions, ["id", "email"]]
+            last_modified = last_modified.loc[latest_positions]
+
+            for contact_id, email, contact_last_modified in zip(
+                contacts["id"].tolist(),
+                contacts["email"].tolist(),
+                last_modified.tolist(),
+            ):
+                latest_contact = latest_contacts.get(email)
+                if latest_contact is None or contact_last_modified > latest_contact[1]:
+                    latest_contacts[email] = (contact_id, contact_last_modified)
+
+        return {contact_id for contact_id, _ in latest_contacts.values()}
+
+    def process_opportunities(self):
         """
         Processes and inserts opportunity data into the database.
 
         This method:
-        1. Reads opportunity data from a CSV file.
-        2. Identifies new opportunities that are not already in the database.
-        3. Cleans, validates, and prepares new opportunities for insertion.
-        4. Performs a bulk insert of new opportunities.
+        1. Reads opportunity data from a CSV file in chunks.
+        2. Cleans, validates, and prepares opportunities for insertion.
+        3. Performs a bulk insert of opportunities, skipping the ones that
+           already exist in the database.
 
-        Args:
-            session (Session): SQLAlchemy database session.
+        Chunks are processed concurrently, see `process_chunks`.
         """
-        opportunities_df_chunk_iter = pd.read_csv(
-            os.path.join(self.data_path, "opportunities.csv"), chunksize=self.chunk_size
+        opportunities_df_chunk_iter = read_csv_chunks(
+            self.opportunities_file_path,
+            self.chunk_size,
+            string_columns=("created_date", "close_date"),
+        )
+        self.process_chunks(
+            self._process_opportunities_chunk, opportunities_df_chunk_iter
         )
-        for opportunities_df in opportunities_df_chunk_iter:
+
+    def _process_opportunities_chunk(self, opportunities_df: pd.DataFrame):
+        for column in ("stage", "forecast_category", "product"):
+            opportunities_df[column] = clean_text_column(opportunities_df[column])
+
+        with db_session() as session, frozen_now(self._now):
             # Process stages, forecast categories, and products to get their IDs
             stages_map = self.process_sub_entities(
                 session, Stage, opportunities_df, "stage"
@@ -285,117 +595,119 @@ class Pipeline:
                 session, Product, opportunities_df, "product"
             )
 
-            # Convert opportunity data into a dictionary with opportunity ID as key
-            opportunities_map = {
-                opportunity["id"]: opportunity
-                for opportunity in opportunities_df.to_dict(orient="records")
-            }
+            # Map stage, forecast category, and product IDs (foreign keys)
+            for column, ids_map in (
+                ("stage", stages_map),
+                ("forecast_category", forecast_categories_map),
+                ("product", products_map),
+            ):
+                opportunities_df[f"{column}_id"] = (
+                    opportunities_df.pop(column).map(ids_map).astype("Int64")
+                )
 
-            # Identify existing opportunities
-            opportunity_ids = list(opportunities_map.keys())
-            existing_opportunities = session.query(Opportunity.id).filter(
-                Opportunity.id.in_(opportunity_ids)
-            )
+            # Only new opportunities are validated and inserted
+            opportunities_df = opportunities_df[
+                self.get_new_records_mask(session, Opportunity, opportunities_df)
+            ]
+            if opportunities_df.empty:
+                return
 
-            # Determine which opportunities are new
-            new_opportunity_ids = set(opportunity_ids) - set(
-                [opportunity.id for opportunity in existing_opportunities.all()]
+            # Validate probabilities and amounts of the whole chunk at once
+            cleaned_opportunities, opportunities_errors = validate_opportunities_batch(
+                opportunities_df
+            )
+            # Parse dates of the whole chunk at once
+            cleaned_opportunities = cleaned_opportunities.join(
+                parse_datetime_columns(opportunities_df, ("created_date", "close_date"))
             )
+            # Standardize text of the whole chunk at once
+            cleaned_opportunities["name"] = title_text_column(opportunities_df["name"])
 
-            # Clean and validate new opportunities
+            # Clean and validate opportunities
             to_create = []
-            for opportunity_id in new_opportunity_ids:
-                opportunity_data = opportunities_map[opportunity_id]
-
-                # Map stage, forecast category, and product IDs
-                opportunity_data["stage_id"] = stages_map[
-                    clean_text(opportunity_data.pop("stage"))
-                ]
-                opportunity_data["forecast_category_id"] = forecast_categories_map[
-                    clean_text(opportunity_data.pop("forecast_category"))
-                ]
-                opportunity_data["product_id"] = products_map[
-                    clean_text(opportunity_data.pop("product"))
-                ]
-
+            to_create_data = []
+            for opportunity_data, cleaned_opportunity_data, errors in zip(
+                iter_records(opportunities_df),
+                iter_records(cleaned_opportunities),
+                opportunities_errors,
+            ):
                 # Create the Opportunity instance
-                opportunity = Opportunity(**opportunity_data)
+                opportunity = Opportunity(
+                    **{**opportunity_data, **cleaned_opportunity_data}
+                )
 
                 # Validate the opportunity
-                is_valid = opportunity.validate()
-                if not is_valid:
-                    self.validation_errors["opportunities"].append(
-                        {
-                            "record": opportunity_data,
-                            "errors": opportunity.validation_errors,
-                        }
-                    )
+                errors += opportunity.validate()
+                if errors:
+                    self.log_validation_error("opportunities", opportunity_data, errors)
                     continue
 
-                to_create.append(opportunity)
+                to_create.append(opportunity.as_dict())
+                to_create_data.append(opportunity_data)
 
-            # Bulk insert new opportunities
-            session.bulk_save_objects(to_create)
-            session.commit()
+            # Bulk insert opportunities, conflicting ones are skipped and reported
+            self.insert_records(
+                session, "opportunities", Opportunity, to_create, to_create_data
+            )
 
-    def process_activities(self, session: Session) -> None:
+    def process_activities(self) -> None:
         """
         Processes and inserts activity data into the database.
 
         This method:
-        1. Reads activity data from a CSV file.
-        2. Identifies new activities that are not already in the database.
-        3. Cleans, validates, and prepares new activities for insertion.
-        4. Performs a bulk insert of new activities.
+        1. Reads activity data from a NDJSON file in chunks.
+        2. Cleans, validates, and prepares activities for insertion.
+        3. Performs a bulk insert of activities, skipping the ones that
+           already exist in the database.
 
-        Args:
-            session (Session): SQLAlchemy database session.
+        Chunks are processed concurrently, see `process_chunks`.
         """
-        # Read activities data from a JSON file
-
-        # NOTE: `chunksize` cannot be used because JSONReader requires file to
-        # be in NDJSON format (i.e. newline-delimited JSON). This can be addressed
-        # in data generation script.
-
-        activities = pd.read_json(os.path.join(self.data_path, "activities.json"))
-
-        # Convert activity data into a dictionary with activity ID as key
-        activities_map = {
-            activity["id"]: activity
-            for activity in activities.to_dict(orient="records")
-        }
-
-        # Identify existing activities
-        activity_ids = list(activities_map.keys())
-        existing_activities = session.query(Activity.id).filter(
-            Activity.id.in_(activity_ids)
-        )
-
-        # Determine which activities are new
-        new_activity_ids = set(activity_ids) - set(
-            [activity.id for activity in existing_activities.all()]
+        self.process_chunks(
+            self._process_activities_chunk,
+            read_json_chunks(
+                self.activities_file_path, self.chunk_size, ACTIVITY_COLUMNS
+            ),
         )
 
-        # Clean and validate new activities
-        to_create = []
-        for activity_id in new_activity_ids:
-            activity_data = activities_map[activity_id]
-
-            activity = Activity(**activity_data)
+    def _process_activities_chunk(self, activities: pd.DataFrame):
+        with db_session() as session, frozen_now(self._now):
+            # Only new activities are validated and inserted
+            activities = activities[
+                self.get_new_records_mask(session, Activity, activities)
+            ]
+            if activities.empty:
+                return
+
+            # Parse timestamps of the whole chunk at once
+            cleaned_activities = parse_datetime_columns(activities, ("timestamp",))
+            # Standardize text of the whole chunk at once
+            cleaned_activities["type"] = clean_text_column(activities["type"])
+            cleaned_activities["outcome"] = clean_text_column(activities["outcome"])
+            cleaned_activities["subject"] = clean_text_column(
+                activities["subject"], lower=True
+            )
 
-            # Validate activity data before insertion
-            is_valid = activity.validate()
-            if not is_valid:
-                self.validation_errors["activities"].append(
-                    {"record": activity_data, "errors": activity.validation_errors}
-                )
-                continue
+            # Clean and validate activities
+            to_create = []
+            to_create_data = []
+            for activity_data, cleaned_activity_data in zip(
+                iter_records(activities), iter_records(cleaned_activities)
+            ):
+                activity = Activity(**{**activity_data, **cleaned_activity_data})
+
+                # Validate activity data before insertion
+                errors = activity.validate()
+                if errors:
+                    self.log_validation_error("activities", activity_data, errors)
+                    continue
 
-            to_create.append(activity)
+                to_create.append(activity.as_dict())
+                to_create_data.append(activity_data)
 
-        # Bulk insert new activities
-        session.bulk_save_objects(to_create)
-        session.commit()
+            # Bulk insert activities, conflicting ones are skipped and reported
+            self.insert_records(
+                session, "activities", Activity, to_create, to_create_data
+            )
 
 
 if __name__ == "__main__":
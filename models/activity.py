@@ -33,15 +33,6 @@ class Activity(BaseModel):
         Index("idx_activities_timestamp", "timestamp"),
     )
 
-    def validate_type(self, key, activity_type):
-        return activity_type.strip().upper()
-
-    def validate_outcome(self, key, outcome):
-        return outcome.strip().upper()
-
-    def validate_subject(self, key, subject):
-        return subject.strip().lower()
-
     def validate_timestamp(self, key, timestamp):
         """
         Validates and standardizes a given timestamp.
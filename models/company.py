@@ -1,7 +1,6 @@
-from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
 
-import country_converter as cc
-import validators
 from sqlalchemy import (
     Boolean,
     Column,
@@ -15,7 +14,49 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 from utils.db import BaseModel
-from utils.etl import standardize_datetime
+from utils.etl import standardize_datetime, utc_now
+
+# Cleaned country names / codes mapped to their ISO2 code (None if not found)
+_COUNTRY_LOOKUP: Dict[str, Optional[str]] = {}
+
+
+@lru_cache(maxsize=None)
+def get_country_converter():
+    """
+    Returns a single, shared `CountryConverter` (`cc.convert` reloads the
+    country data on each call). `country_converter` is only imported and its
+    data loaded on first use.
+    """
+    import country_converter as cc
+
+    return cc.CountryConverter()
+
+
+def convert_countries(countries: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Converts country names or codes to ISO 2-letter country codes.
+
+    Conversions are cached at module level, `country_converter` is only
+    called once for all the values not converted yet.
+
+    Args:
+        countries (Iterable[str]): Country names or codes.
+
+    Returns:
+        dict: The cleaned (stripped and upper-cased) countries mapped to
+        their ISO2 country code, or None if they are invalid.
+    """
+    countries = {country.strip().upper() for country in countries}
+    missing = [country for country in countries if country not in _COUNTRY_LOOKUP]
+    if missing:
+        codes = get_country_converter().convert(names=missing, to="ISO2", not_found=404)
+        # A single name is converted to a single code rather than a list
+        if len(missing) == 1:
+            codes = [codes]
+        for country, code in zip(missing, codes):
+            _COUNTRY_LOOKUP[country] = None if code == 404 else code
+
+    return {country: _COUNTRY_LOOKUP[country] for country in countries}
 
 
 class Industry(BaseModel):
@@ -26,8 +67,6 @@ class Industry(BaseModel):
     # Relationships
     companies = relationship("Company", back_populates="industry")
 
-    __table_args__ = (Index("idx_industries_name", "name"),)
-
 
 class Company(BaseModel):
     __tablename__ = "companies"
@@ -49,29 +88,7 @@ class Company(BaseModel):
     contacts = relationship("Contact", back_populates="company")
     opportunities = relationship("Opportunity", back_populates="company")
 
-    __table_args__ = (
-        Index("idx_companies_domain", "domain"),
-        Index("idx_companies_industry_id", "industry_id"),
-    )
-
-    def validate_name(self, key, name):
-        return name.strip().upper()
-
-    def validate_domain(self, key, domain):
-        """
-        Validates the format of a given domain string.
-
-        Returns:
-            str: The validated domain string if it is valid.
-
-        Raises:
-            ValueError: If the domain string is formatted incorrectly or logically invalid.
-        """
-        domain = domain.strip()
-        is_valid = validators.domain(domain)
-        if not is_valid:
-            raise ValueError(f"{key}: {domain} is invalid.")
-        return domain
+    __table_args__ = (Index("idx_companies_industry_id", "industry_id"),)
 
     def validate_size(self, key, size):
         """
@@ -138,10 +155,10 @@ class Company(BaseModel):
               Raises ValueError
         """
         country = country.strip().upper()
-        country = cc.convert(names=[country], to="ISO2", not_found=404)
-        if country == 404:
+        iso2_country = convert_countries([country])[country]
+        if iso2_country is None:
             raise ValueError(f"{key}: {country} is invalid.")
-        return country
+        return iso2_country
 
     def validate_created_date(self, key, created_date):
         """
@@ -172,7 +189,7 @@ class Company(BaseModel):
                 f"{key}: {created_date} is invalid. Please consider ISO 8601 format."
             )
 
-        if created_date > datetime.now(tz=created_date.tzinfo):
+        if created_date > utc_now():
             raise ValueError(f"{key}: cannot be in future: {created_date}")
 
         return created_date
@@ -1,11 +1,8 @@
-from datetime import datetime
-
-import validators
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, exists
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
-from utils.db import BaseModel, db_session
-from utils.etl import normalize_phone_number, standardize_datetime
+from utils.db import BaseModel
+from utils.etl import standardize_datetime, utc_now
 
 
 class ContactStatus(BaseModel):
@@ -17,8 +14,6 @@ class ContactStatus(BaseModel):
     # Relationships
     contacts = relationship("Contact", back_populates="status")
 
-    __table_args__ = (Index("idx_contact_statuses_name", "name"),)
-
 
 class Contact(BaseModel):
     __tablename__ = "contacts"
@@ -44,57 +39,10 @@ class Contact(BaseModel):
     activities = relationship("Activity", back_populates="contact")
 
     __table_args__ = (
-        Index("idx_contacts_email", "email"),
         Index("idx_contacts_company_id", "company_id"),
         Index("idx_contacts_status_id", "status_id"),
     )
 
-    def validate_email(self, key, email):
-        """
-        Validates the email address format.
-        """
-        email = email.strip()
-        is_valid = validators.email(email)
-        if not is_valid:
-            raise ValueError(f"{key}: {email} is not a valid email address.")
-
-        with db_session() as session:
-            contact_found = session.query(
-                exists().where(Contact.email == email)
-            ).scalar()
-            if contact_found:
-                raise ValueError(f"{key}: A contact already exists with email {email}.")
-
-        return email
-
-    def validate_first_name(self, key, name):
-        return name.strip().title()
-
-    def validate_last_name(self, key, name):
-        return name.strip().title()
-
-    def validate_title(self, key, title):
-        return title.strip()
-
-    def validate_phone(self, key, phone):
-        """
-        Validates the phone number format and normalize it
-        to standard international format.
-
-        Returns:
-            str: The normalized phone number.
-
-        Raises:
-            ValueError: If the phone number is invalid.
-        """
-        phone, is_normalized = normalize_phone_number(phone.strip(), None)
-        if not is_normalized:
-            raise ValueError(
-                f"{key}: {phone} is not a valid. "
-                "Please provide a valid phone number in international format."
-            )
-        return phone
-
     def validate_created_date(self, key, created_date):
         """
         Validates and standardizes the created_date.
@@ -114,7 +62,7 @@ class Contact(BaseModel):
                 f"{key}: {created_date} is invalid. Please use ISO 8601 format."
             )
 
-        if created_date > datetime.now(tz=created_date.tzinfo):
+        if created_date > utc_now():
             raise ValueError(f"{key}: cannot be in the future {created_date}")
         return created_date
 
@@ -137,7 +85,7 @@ class Contact(BaseModel):
                 f"{key}: {last_modified} is invalid. Please use ISO 8601 format."
             )
 
-        if last_modified > datetime.now(tz=last_modified.tzinfo):
+        if last_modified > utc_now():
             raise ValueError(f"{key}: cannot be in the future {last_modified}")
 
         if hasattr(self, "created_date") and last_modified < self.created_date:
@@ -1,5 +1,3 @@
-from datetime import datetime
-
 from sqlalchemy import (
     Boolean,
     Column,
@@ -13,7 +11,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 from utils.db import BaseModel
-from utils.etl import standardize_datetime
+from utils.etl import standardize_datetime, utc_now
 
 
 class Stage(BaseModel):
@@ -24,8 +22,6 @@ class Stage(BaseModel):
 
     opportunities = relationship("Opportunity", back_populates="stage")
 
-    __table_args__ = (Index("idx_stages_name", "name"),)
-
 
 class ForecastCategory(BaseModel):
     __tablename__ = "forecast_categories"
@@ -35,8 +31,6 @@ class ForecastCategory(BaseModel):
 
     opportunities = relationship("Opportunity", back_populates="forecast_category")
 
-    __table_args__ = (Index("idx_forecast_categories_name", "name"),)
-
 
 class Product(BaseModel):
     __tablename__ = "products"
@@ -46,8 +40,6 @@ class Product(BaseModel):
 
     opportunities = relationship("Opportunity", back_populates="product")
 
-    __table_args__ = (Index("idx_products_name", "name"),)
-
 
 class Opportunity(BaseModel):
     __tablename__ = "opportunities"
@@ -86,47 +78,6 @@ class Opportunity(BaseModel):
         Index("idx_opportunities_forecast_category_id", "forecast_category_id"),
     )
 
-    def validate_name(self, key, name):
-        return name.strip().title()
-
-    def validate_probability(self, key, probability):
-        """
-        Validates the probability.
-
-        Ensures the probability is between 0 and 100.
-        """
-        try:
-            probability = int(probability)
-        except ValueError:
-            raise ValueError(f"{key}: {probability} must be a valid integer.")
-
-        if not (0 <= probability <= 100):
-            raise ValueError(f"{key}: {probability} must be between 0 and 100.")
-
-        return probability
-
-    def validate_amount(self, key, amount):
-        """
-        Validates the amount value.
-
-        Ensures the amount is a non-negative float.
-
-        Returns:
-            float: The validated amount.
-
-        Raises:
-            ValueError: If the amount is negative or not a valid float.
-        """
-        try:
-            amount = float(amount)
-        except ValueError:
-            raise ValueError(f"{key}: {amount} must be a valid numeric value.")
-
-        if amount < 0:
-            raise ValueError(f"{key}: {amount} cannot be negative.")
-
-        return amount
-
     def validate_created_date(self, key, created_date):
         """
         Validates and standardizes the created_date.
@@ -146,7 +97,7 @@ class Opportunity(BaseModel):
                 f"{key}: {created_date} is invalid. Please use ISO 8601 format."
             )
 
-        if created_date > datetime.now(tz=created_date.tzinfo):
+        if created_date > utc_now():
             raise ValueError(
                 f"{key}: Created date cannot be in the future: {created_date}"
             )
@@ -0,0 +1,347 @@
+"""
+Batch validators applied on DataFrame chunks before per-record model validation.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from sqlalchemy.orm import Session
+
+from models.company import Company
+from models.contact import Contact
+from utils.db import select_where_in
+from utils.etl import normalize_phone_number
+
+# Patterns are matched on PyArrow backed strings, i.e. by RE2 (a DFA based,
+# non-backtracking engine) over the contiguous buffer of the whole column
+
+# Cheap pre-filters, values not matching them can never be valid
+EMAIL_PATTERN = r"^.+@[^@]+$"
+# Phone numbers are parsed without a default region, so they must
+# be in international format (i.e. starting with a plus sign)
+INTERNATIONAL_PHONE_PATTERN = r"[+＋]"
+# `validators.domain`'s pattern (case insensitive), ASCII domains matching it
+# (up to 253 characters) are valid, the other ones go through `validators.domain`
+# as they may be internationalized domain names
+DOMAIN_PATTERN = (
+    r"(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9][a-z0-9-]{0,61}[a-z]"
+)
+DOMAIN_MAX_LENGTH = 253
+# Boolean strings accepted (case insensitive), like PyArrow's CSV reader
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+def to_numeric_column(
+    values: pd.Series, key: str, errors: List[List[str]]
+) -> pd.Series:
+    """
+    Converts a column to numbers, reporting the values which aren't.
+
+    Args:
+        values (Series): Column to convert, of numbers or strings.
+        key (str): Name of the column, used in the error messages.
+        errors (list): Validation errors of each row, appended in place.
+
+    Returns:
+        Series: The converted `Float64` column, invalid values are missing.
+    """
+    numbers = pd.to_numeric(values, errors="coerce").astype("Float64")
+    for position in np.flatnonzero(values.notna() & numbers.isna()):
+        errors[position].append(
+            f"{key}: {values.iloc[position]} must be a valid numeric value."
+        )
+    return numbers
+
+
+def to_boolean_column(
+    values: pd.Series, key: str, errors: List[List[str]]
+) -> pd.Series:
+    """
+    Converts a column to booleans, reporting the values which aren't.
+
+    Args:
+        values (Series): Column to convert, of booleans or strings.
+        key (str): Name of the column, used in the error messages.
+        errors (list): Validation errors of each row, appended in place.
+
+    Returns:
+        Series: The converted `boolean` column, invalid values are missing.
+    """
+    if is_bool_dtype(values):
+        return values.astype("boolean")
+
+    booleans = (
+        values.astype("string[pyarrow]")
+        .str.strip()
+        .str.lower()
+        .map(BOOLEAN_VALUES, na_action="ignore")
+        .astype("boolean")
+    )
+    for position in np.flatnonzero(values.notna() & booleans.isna()):
+        errors[position].append(
+            f"{key}: {values.iloc[position]} must be a valid boolean."
+        )
+    return booleans
+
+
+def validate_companies_batch(
+    session: Session, companies: pd.DataFrame
+) -> Tuple[pd.DataFrame, List[List[str]]]:
+    """
+    Validates and normalizes the `domain`, `is_customer` and `annual_revenue`
+    columns of companies.
+
+    This function:
+    1. Validates domain formats, `validators.domain` only runs for the domains
+       not matching the vectorized ASCII domain pattern.
+    2. Checks, in a single query, for domains already taken by other companies,
+       or by a previous company of the same batch.
+    3. Converts `is_customer` to booleans and `annual_revenue` to numbers,
+       which are strings when the CSV chunk holds malformed values.
+
+    Missing values are left to the model's not-null validation.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        companies (DataFrame): Pandas DataFrame containing companies.
+
+    Returns:
+        tuple: A DataFrame with the cleaned columns and the list of
+        validation errors of each company (in the same order).
+    """
+    import validators
+
+    errors = [[] for _ in range(len(companies))]
+
+    domains = companies["domain"].astype("string[pyarrow]").str.strip()
+    matches_domain_pattern = (
+        domains.str.fullmatch(DOMAIN_PATTERN, case=False)
+        & (domains.str.len() <= DOMAIN_MAX_LENGTH)
+    ).fillna(False)
+    matches_domain_pattern = matches_domain_pattern.tolist()
+    domains = domains.to_numpy(dtype=object, na_value=None).tolist()
+
+    valid_domain_positions = []
+    for position, (domain, matches_pattern) in enumerate(
+        zip(domains, matches_domain_pattern)
+    ):
+        if domain is None:
+            continue
+
+        if matches_pattern:
+            valid_domain_positions.append(position)
+            continue
+
+        try:
+            is_valid = validators.domain(domain)
+        except UnicodeError as e:
+            errors[position].append(str(e))
+            continue
+
+        if is_valid:
+            valid_domain_positions.append(position)
+        else:
+            errors[position].append(f"domain: {domain} is invalid.")
+
+    # Validate domains are not already taken by other companies
+    if valid_domain_positions:
+        company_ids = companies["id"].tolist()
+        existing_companies = select_where_in(
+            session,
+            [Company.domain, Company.id],
+            Company.domain,
+            list({domains[i] for i in valid_domain_positions}),
+        )
+        existing_company_ids = dict(existing_companies)
+        for position in valid_domain_positions:
+            domain = domains[position]
+            existing_company_id = existing_company_ids.get(domain)
+            if existing_company_id not in (None, company_ids[position]):
+                errors[position].append(
+                    f"domain: A company already exists with domain {domain}."
+                )
+            else:
+                # The next companies of the batch can't take this domain
+                existing_company_ids[domain] = company_ids[position]
+
+    cleaned_companies = pd.DataFrame({"domain": domains}, index=companies.index)
+    for key, to_column in (
+        ("is_customer", to_boolean_column),
+        ("annual_revenue", to_numeric_column),
+    ):
+        if key in companies:
+            cleaned_companies[key] = to_column(companies[key], key, errors)
+    return cleaned_companies, errors
+
+
+def validate_contacts_batch(
+    session: Session, contacts: pd.DataFrame
+) -> Tuple[pd.DataFrame, List[List[str]]]:
+    """
+    Validates and normalizes the `email` and `phone` columns of contacts.
+
+    This function:
+    1. Validates email formats, `validators.email` only runs for the emails
+       matching the vectorized pre-filter pattern.
+    2. Checks, in a single query, for emails already taken by other contacts.
+    3. Normalizes phone numbers to international format, `phonenumbers` only
+       runs for the numbers matching the vectorized pre-filter pattern.
+
+    Missing values are left to the model's not-null validation.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        contacts (DataFrame): Pandas DataFrame containing contacts.
+
+    Returns:
+        tuple: A DataFrame with the cleaned `email` and `phone` columns and
+        the list of validation errors of each contact (in the same order).
+    """
+    import validators
+
+    errors = [[] for _ in range(len(contacts))]
+
+    # Validate email formats
+    emails = contacts["email"].astype("string[pyarrow]").str.strip()
+    matches_email_pattern = emails.str.match(EMAIL_PATTERN).fillna(False).tolist()
+    emails = emails.to_numpy(dtype=object, na_value=None).tolist()
+
+    valid_email_positions = []
+    for position, (email, matches_pattern) in enumerate(
+        zip(emails, matches_email_pattern)
+    ):
+        if email is None:
+            continue
+
+        if matches_pattern and validators.email(email):
+            valid_email_positions.append(position)
+        else:
+            errors[position].append(f"email: {email} is not a valid email address.")
+
+    # Validate emails are not already taken by other contacts
+    if valid_email_positions:
+        contact_ids = contacts["id"].tolist()
+        existing_contacts = select_where_in(
+            session,
+            [Contact.email, Contact.id],
+            Contact.email,
+            [emails[i] for i in valid_email_positions],
+        )
+        existing_contact_ids = dict(existing_contacts)
+        for position in valid_email_positions:
+            email = emails[position]
+            existing_contact_id = existing_contact_ids.get(email)
+            # Re-processed contacts are skipped on insert so only
+            # a different contact holding the email is a conflict
+            if existing_contact_id not in (None, contact_ids[position]):
+                errors[position].append(
+                    f"email: A contact already exists with email {email}."
+                )
+
+    # Validate and normalize phone numbers
+    phones = contacts["phone"].astype("string[pyarrow]").str.strip()
+    matches_phone_pattern = (
+        phones.str.contains(INTERNATIONAL_PHONE_PATTERN).fillna(False).tolist()
+    )
+    phones = phones.to_numpy(dtype=object, na_value=None).tolist()
+
+    for position, (phone, matches_pattern) in enumerate(
+        zip(phones, matches_phone_pattern)
+    ):
+        if phone is None:
+            continue
+
+        is_normalized = False
+        if matches_pattern:
+            phone, is_normalized = normalize_phone_number(phone, None)
+
+        if is_normalized:
+            phones[position] = phone
+        else:
+            errors[position].append(
+                f"phone: {phone} is not a valid. "
+                "Please provide a valid phone number in international format."
+            )
+
+    cleaned_contacts = pd.DataFrame(
+        {"email": emails, "phone": phones}, index=contacts.index
+    )
+    return cleaned_contacts, errors
+
+
+def validate_opportunities_batch(
+    opportunities: pd.DataFrame,
+) -> Tuple[pd.DataFrame, List[List[str]]]:
+    """
+    Validates and converts the `probability`, `amount` and `is_closed`
+    columns of opportunities.
+
+    Numeric columns are coerced to numbers and range checked in a single
+    vectorized pass each, error messages are only built for invalid values.
+    Like `int()`, numeric probabilities are truncated while decimal strings
+    are invalid. `is_closed` is converted to booleans, it's a string column
+    when the CSV chunk holds malformed values. Missing values are left to the
+    model's not-null validation.
+
+    Args:
+        opportunities (DataFrame): Pandas DataFrame containing opportunities.
+
+    Returns:
+        tuple: A DataFrame with the converted columns and the list of
+        validation errors of each opportunity (in the same order).
+    """
+    errors = [[] for _ in range(len(opportunities))]
+
+    # Validate probabilities are integers between 0 and 100
+    probabilities = opportunities["probability"]
+    numeric_probabilities = pd.to_numeric(probabilities, errors="coerce").astype(
+        "Float64"
+    )
+    if is_numeric_dtype(probabilities):
+        numeric_probabilities = np.trunc(numeric_probabilities)
+    else:
+        numeric_probabilities = numeric_probabilities.mask(
+            (numeric_probabilities % 1 != 0).fillna(False)
+        )
+    invalid_probabilities = probabilities.notna() & numeric_probabilities.isna()
+    out_of_range_probabilities = (
+        (numeric_probabilities < 0) | (numeric_probabilities > 100)
+    ).fillna(False)
+
+    for position in np.flatnonzero(invalid_probabilities):
+        errors[position].append(
+            f"probability: {probabilities.iloc[position]} must be a valid integer."
+        )
+    for position in np.flatnonzero(out_of_range_probabilities):
+        errors[position].append(
+            f"probability: {probabilities.iloc[position]} must be between 0 and 100."
+        )
+    # Out of range values (e.g. `inf`) can't be cast to integers, they're
+    # kept as floats (their records are invalid anyway)
+    numeric_probabilities = (
+        numeric_probabilities.mask(out_of_range_probabilities)
+        .astype("Int64")
+        .astype(object)
+        .mask(out_of_range_probabilities, numeric_probabilities)
+    )
+
+    # Validate amounts are non-negative numbers
+    numeric_amounts = to_numeric_column(opportunities["amount"], "amount", errors)
+    negative_amounts = (numeric_amounts < 0).fillna(False)
+
+    for position in np.flatnonzero(negative_amounts):
+        errors[position].append(
+            f"amount: {numeric_amounts.iloc[position]} cannot be negative."
+        )
+
+    cleaned_opportunities = pd.DataFrame(
+        {"probability": numeric_probabilities, "amount": numeric_amounts},
+        index=opportunities.index,
+    )
+    if "is_closed" in opportunities:
+        cleaned_opportunities["is_closed"] = to_boolean_column(
+            opportunities["is_closed"], "is_closed", errors
+        )
+    return cleaned_opportunities, errors
@@ -9,7 +9,6 @@ CREATE TABLE contact_statuses (
 	PRIMARY KEY (id), 
 	UNIQUE (name)
 );
-CREATE INDEX idx_contact_statuses_name ON contact_statuses (name);
 CREATE TABLE forecast_categories (
 	id INTEGER NOT NULL, 
 	name VARCHAR NOT NULL, 
@@ -17,14 +16,12 @@ CREATE TABLE forecast_categories (
 	PRIMARY KEY (id), 
 	UNIQUE (name)
 );
-CREATE INDEX idx_forecast_categories_name ON forecast_categories (name);
 CREATE TABLE industries (
 	id INTEGER NOT NULL, 
 	name VARCHAR NOT NULL, 
 	PRIMARY KEY (id), 
 	UNIQUE (name)
 );
-CREATE INDEX idx_industries_name ON industries (name);
 CREATE TABLE products (
 	id INTEGER NOT NULL, 
 	name VARCHAR NOT NULL, 
@@ -32,7 +29,6 @@ CREATE TABLE products (
 	PRIMARY KEY (id), 
 	UNIQUE (name)
 );
-CREATE INDEX idx_products_name ON products (name);
 CREATE TABLE stages (
 	id INTEGER NOT NULL, 
 	name VARCHAR NOT NULL, 
@@ -40,7 +36,6 @@ CREATE TABLE stages (
 	PRIMARY KEY (id), 
 	UNIQUE (name)
 );
-CREATE INDEX idx_stages_name ON stages (name);
 CREATE TABLE companies (
 	id VARCHAR NOT NULL, 
 	industry_id INTEGER NOT NULL, 
@@ -55,7 +50,6 @@ CREATE TABLE companies (
 	FOREIGN KEY(industry_id) REFERENCES industries (id), 
 	UNIQUE (domain)
 );
-CREATE INDEX idx_companies_domain ON companies (domain);
 CREATE INDEX idx_companies_industry_id ON companies (industry_id);
 CREATE TABLE contacts (
 	id VARCHAR NOT NULL, 
@@ -74,7 +68,6 @@ CREATE TABLE contacts (
 	UNIQUE (email)
 );
 CREATE INDEX idx_contacts_company_id ON contacts (company_id);
-CREATE INDEX idx_contacts_email ON contacts (email);
 CREATE INDEX idx_contacts_status_id ON contacts (status_id);
 CREATE TABLE opportunities (
 	id VARCHAR NOT NULL, 
@@ -144,6 +144,6 @@ activities = generate_activities(contacts, opportunities, 1000)
 
 # Save to multiple formats
 companies.to_csv("data/salesforce/companies.csv", index=False)
-contacts.to_json("data/salesforce/contacts.json", orient="records")
+contacts.to_json("data/salesforce/contacts.json", orient="records", lines=True)
 opportunities.to_csv("data/salesforce/opportunities.csv", index=False)
-activities.to_json("data/salesforce/activities.json", orient="records")
+activities.to_json("data/salesforce/activities.json", orient="records", lines=True)
@@ -3,37 +3,82 @@ Sample queries to retrieve data inserted by ETL pipeline from the database
 """
 
 import logging
+from functools import lru_cache
 
 import sqlparse
-from sqlalchemy import and_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import joinedload, selectinload
 
 from models import Activity, Company, Contact, ContactStatus, Opportunity
-from utils.db import db_session
+from utils.db import db_session, engine
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Statements are built once, their compiled form is cached by SQLAlchemy
+USER_ACTIVITIES_STMT = (
+    select(Activity).where(Activity.contact_id == bindparam("user_id")).limit(10)
+)
+
+HIGH_REVENUE_COMPANIES_STMT = (
+    select(Company)
+    .where(Company.is_customer.is_(True), Company.annual_revenue > 1_000_000)
+    .limit(10)
+)
+
+# Collections are loaded by a separate SELECT ... IN query each, joining
+# them would multiply the rows returned for every contact
+CONTACTS_BY_STATUS_STMT = (
+    select(Contact)
+    .join(ContactStatus, ContactStatus.id == Contact.status_id)
+    .where(ContactStatus.name == bindparam("status"))
+    .options(
+        joinedload(Contact.company),
+        selectinload(Contact.opportunities),
+        selectinload(Contact.activities),
+    )
+    .limit(10)
+)
+
+ACTIVITIES_WITH_OPPORTUNITIES_STMT = (
+    select(Activity).options(joinedload(Activity.opportunity)).limit(10)
+)
+
+OPPORTUNITIES_WITH_ACTIVITIES_STMT = (
+    select(Opportunity).options(selectinload(Opportunity.activities)).limit(10)
+)
+
+
+@lru_cache(maxsize=64)
+def format_sql(stmt):
+    """
+    Returns the formatted SQL of a statement, compiled for the engine's dialect.
+    """
+    sql = str(stmt.compile(dialect=engine.dialect))
+    return sqlparse.format(sql, reindent=True, keyword_case="upper")
+
+
+def log_query(title, stmt, *args):
+    """
+    Logs the title of a sample query, and its SQL at DEBUG level only, so
+    the statement isn't compiled and formatted otherwise.
+    """
+    logger.info(title, *args)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("SQL:\n%s", format_sql(stmt))
+
 
 def get_user_activities(session, user_id):
     """
     Get a user's activities based on the contact_id, limited to 10 records.
     """
-    activities = (
-        session.query(Activity).filter(Activity.contact_id == user_id).limit(10)
-    )
 
-    print("-------------------------------------------------")
-    print(" Activities for User {user_id} (LIMIT 10)")
-    print("-------------------------------------------------")
-    print("\n --------- SQL Start ---------")
-    print(
-        f"\n {sqlparse.format(f"{activities}", reindent=True, keyword_case='upper')} \n"
-    )
-    print("--------- SQL End --------- \n")
-
-    print("\nOUTPUT: \n")
-    for activity in activities.all():
+    log_query("Activities for User %s (LIMIT 10)", USER_ACTIVITIES_STMT, user_id)
+    # Stream activities instead of loading them all at once
+    for activity in session.scalars(
+        USER_ACTIVITIES_STMT.execution_options(yield_per=1000),
+        {"user_id": user_id},
+    ):
         logger.info(
             "Activity ID: %s - Subject: %s - Timestamp: %s",
             activity.id,
@@ -46,23 +91,12 @@ def get_companies_with_high_revenue(session):
     """
     Get companies that are customers and have an annual revenue greater than 1M, limited to 10 records.
     """
-    companies = (
-        session.query(Company)
-        .filter(Company.is_customer.is_(True), Company.annual_revenue > 1_000_000)
-        .limit(10)
-    )
 
-    print("-------------------------------------------------")
-    print(" Companies that are Customers with Revenue > 1M (LIMIT 10)")
-    print("-------------------------------------------------")
-    print("\n --------- SQL Start ---------")
-    print(
-        f"\n {sqlparse.format(f"{companies}", reindent=True, keyword_case='upper')} \n"
+    log_query(
+        "Companies that are Customers with Revenue > 1M (LIMIT 10)",
+        HIGH_REVENUE_COMPANIES_STMT,
     )
-    print("--------- SQL End --------- \n")
-
-    print("\nOUTPUT: \n")
-    for company in companies.all():
+    for company in session.scalars(HIGH_REVENUE_COMPANIES_STMT):
         logger.info("Company: %s - Revenue: %s", company.name, company.annual_revenue)
 
 
@@ -71,31 +105,9 @@ def get_contacts_by_status_and_joined_load(session):
     Get contacts by status and perform a joined load for company, opportunities, and activities, limited to 10 records.
     """
     status = "LEAD"
-    contacts = (
-        session.query(Contact)
-        .join(
-            ContactStatus,
-            and_(ContactStatus == status, ContactStatus.id == Contact.status_id),
-        )
-        .options(
-            joinedload(Contact.company),
-            joinedload(Contact.opportunities),
-            joinedload(Contact.activities),
-        )
-        .limit(10)
-    )
 
-    print("-------------------------------------------------")
-    print(" Contacts with Status: {status} (LIMIT 10)")
-    print("-------------------------------------------------")
-    print("\n --------- SQL Start ---------")
-    print(
-        f"\n {sqlparse.format(f"{contacts}", reindent=True, keyword_case='upper')} \n"
-    )
-    print("--------- SQL End --------- \n")
-
-    print("\nOUTPUT: \n")
-    for contact in contacts.all():
+    log_query("Contacts with Status: %s (LIMIT 10)", CONTACTS_BY_STATUS_STMT, status)
+    for contact in session.scalars(CONTACTS_BY_STATUS_STMT, {"status": status}):
         logger.info("Contact: %s %s", contact.first_name, contact.last_name)
         logger.info(
             "Company: %s", contact.company.name if contact.company else "No Company"
@@ -113,21 +125,12 @@ def get_activities_with_opportunities(session):
     """
     Get activities and join load opportunities, limited to 10 records.
     """
-    activities_with_opportunities = (
-        session.query(Activity).options(joinedload(Activity.opportunity)).limit(10)
-    )
 
-    print("-------------------------------------------------")
-    print(" Activities with associated Opportunities (LIMIT 10)")
-    print("-------------------------------------------------")
-    print("\n --------- SQL Start ---------")
-    print(
-        f"\n {sqlparse.format(f"{activities_with_opportunities}", reindent=True, keyword_case='upper')} \n"
+    log_query(
+        "Activities with associated Opportunities (LIMIT 10)",
+        ACTIVITIES_WITH_OPPORTUNITIES_STMT,
     )
-    print("--------- SQL End --------- \n")
-
-    print("\nOUTPUT: \n")
-    for activity in activities_with_opportunities.all():
+    for activity in session.scalars(ACTIVITIES_WITH_OPPORTUNITIES_STMT):
         logger.info("Activity: %s", activity.subject)
         logger.info(
             "Opportunity: %s",
@@ -139,21 +142,12 @@ def get_opportunities_with_activities(session):
     """
     Get opportunities and join load activities, limited to 10 records.
     """
-    opportunities_with_activities = (
-        session.query(Opportunity).options(joinedload(Opportunity.activities)).limit(10)
-    )
 
-    print("-------------------------------------------------")
-    print(" Opportunities with associated Activities (LIMIT 10)")
-    print("-------------------------------------------------")
-    print("\n --------- SQL Start ---------")
-    print(
-        f"\n {sqlparse.format(f"{opportunities_with_activities}", reindent=True, keyword_case='upper')} \n"
+    log_query(
+        "Opportunities with associated Activities (LIMIT 10)",
+        OPPORTUNITIES_WITH_ACTIVITIES_STMT,
     )
-    print("--------- SQL End --------- \n")
-
-    print("\nOUTPUT: \n")
-    for opportunity in opportunities_with_activities.all():
+    for opportunity in session.scalars(OPPORTUNITIES_WITH_ACTIVITIES_STMT):
         logger.info("Opportunity: %s", opportunity.name)
         logger.info(
             "Activities: %s", [activity.subject for activity in opportunity.activities]
@@ -161,6 +155,8 @@ def get_opportunities_with_activities(session):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG)
 
     user_id = "CONT095"
     with db_session() as session:
@@ -0,0 +1,15 @@
+import pytest
+
+from utils.db import BaseModel
+from utils.db import db_session as mock_db_session
+from utils.db import engine as mock_engine
+
+
+@pytest.fixture
+def db_session():
+    """Set up the database schema and provide a session."""
+    BaseModel.metadata.create_all(bind=mock_engine)
+    with mock_db_session() as session:
+        yield session
+
+    BaseModel.metadata.drop_all(bind=mock_engine)
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from models import Industry
+from utils.db import IN_BATCH_SIZE, select_where_in
+
+
+class RecordingSession:
+    """
+    Session bound to a PostgreSQL dialect, recording the executed statements
+    instead of running them.
+    """
+
+    def __init__(self):
+        self.executed = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=postgresql.dialect())
+
+    def execute(self, statement, **kwargs):
+        self.executed.append((statement, kwargs))
+        return []
+
+
+class TestSelectWhereIn:
+    """
+    Test cases for looking up rows by a list of values.
+    """
+
+    def test_more_values_than_batch_size(self, db_session):
+        """
+        Test all the matching rows are returned when values span several batches.
+        """
+        names = [f"INDUSTRY {i}" for i in range(2 * IN_BATCH_SIZE + 1)]
+        db_session.execute(insert(Industry), [{"name": name} for name in names])
+        db_session.commit()
+        # Every other name exists, the first and last batches included
+        values = names[::2] + [f"MISSING {i}" for i in range(IN_BATCH_SIZE)]
+
+        rows = list(select_where_in(db_session, [Industry.name], Industry.name, values))
+
+        assert len(values) > 2 * IN_BATCH_SIZE
+        assert sorted(name for (name,) in rows) == sorted(names[::2])
+
+    def test_no_values(self, db_session):
+        """
+        Test looking up no values returns no rows.
+        """
+        db_session.execute(insert(Industry), [{"name": "TECHNOLOGY"}])
+        db_session.commit()
+
+        assert (
+            list(select_where_in(db_session, [Industry.name], Industry.name, [])) == []
+        )
+
+    def test_postgresql_single_array_parameter(self):
+        """
+        Test values are bound as a single array parameter on PostgreSQL,
+        however many they are.
+        """
+        session = RecordingSession()
+        values = [f"INDUSTRY {i}" for i in range(2 * IN_BATCH_SIZE + 1)]
+
+        rows = list(select_where_in(session, [Industry.id], Industry.name, values))
+
+        assert rows == []
+        [(statement, kwargs)] = session.executed
+        compiled = statement.compile(dialect=postgresql.dialect())
+        assert "industries.name = ANY (%(values)s::VARCHAR[])" in str(compiled)
+        assert compiled.params == {"values": values}
+        assert kwargs == {"execution_options": {"yield_per": 10000}}
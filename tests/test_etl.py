@@ -0,0 +1,79 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+
+from models import Company
+from utils.etl import frozen_now, read_csv_chunks, utc_now
+
+
+class TestReadCsvChunks:
+    """
+    Test cases for streaming CSV files as DataFrame chunks.
+    """
+
+    def test_malformed_value_past_first_block(self, tmp_path):
+        """
+        Test a malformed value after the first block only keeps its chunk's
+        column as strings, rather than failing the whole file.
+        """
+        file_path = tmp_path / "opportunities.csv"
+        rows = [(f"OPP{i}", i, "True", "2024-06-15") for i in range(1000)]
+        rows.append(("OPP1000", "abc", "maybe", "2024-06-15"))
+        with open(file_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("id", "amount", "is_closed", "created_date"))
+            writer.writerows(rows)
+
+        chunks = list(
+            read_csv_chunks(
+                file_path,
+                chunk_size=100,
+                block_size=1024,
+                string_columns=("created_date",),
+            )
+        )
+
+        assert sum(len(chunk) for chunk in chunks) == 1001
+        first_chunk, last_chunk = chunks[0], chunks[-1]
+        assert first_chunk["amount"].dtype == pd.ArrowDtype(pa.int64())
+        assert first_chunk["is_closed"].dtype == pd.ArrowDtype(pa.bool_())
+        assert first_chunk["created_date"].dtype == pd.ArrowDtype(pa.string())
+        assert first_chunk["amount"].tolist()[:2] == [0, 1]
+        assert last_chunk["amount"].tolist()[-1] == "abc"
+        assert last_chunk["is_closed"].tolist()[-1] == "maybe"
+
+
+class TestFrozenNow:
+    """
+    Test cases for freezing the "now" the dates are validated against.
+    """
+
+    def test_model_validators_see_frozen_now(self):
+        """
+        Test the date validators compare dates with the frozen "now".
+        """
+        with frozen_now(datetime(2024, 1, 1, tzinfo=timezone.utc)):
+            errors = Company(created_date="2024-06-15T08:45:00").validate()
+
+        assert "created_date: cannot be in future: 2024-06-15 08:45:00+00:00" in errors
+        errors = Company(created_date="2024-06-15T08:45:00").validate()
+        assert not any(error.startswith("created_date") for error in errors)
+
+    def test_worker_threads(self):
+        """
+        Test worker threads don't inherit the frozen "now", they see it by
+        freezing the caller's snapshot again (as the pipeline's chunks do).
+        """
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        def refreeze_utc_now(now):
+            with frozen_now(now):
+                return utc_now()
+
+        with frozen_now(now), ThreadPoolExecutor(max_workers=1) as executor:
+            assert utc_now() is now
+            assert executor.submit(utc_now).result() > now
+            assert executor.submit(refreeze_utc_now, utc_now()).result() is now
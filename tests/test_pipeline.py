@@ -1,27 +1,27 @@
+import csv
+import json
 import os
+from datetime import datetime, timezone
 
+import orjson
 import pandas as pd
 import pytest
 
 from etl.pipeline import Pipeline
-from models import Company, ContactStatus, ForecastCategory, Industry, Product, Stage
-from utils.db import BaseModel
-from utils.db import db_session as mock_db_session
-from utils.db import engine as mock_engine
+from models import (
+    Company,
+    Contact,
+    ContactStatus,
+    ForecastCategory,
+    Industry,
+    Product,
+    Stage,
+)
+from utils.etl import frozen_now
 
 errors_path = "tests/data/errors"
 
 
-@pytest.fixture
-def db_session():
-    """Set up the database schema and provide a session."""
-    BaseModel.metadata.create_all(bind=mock_engine)
-    with mock_db_session() as session:
-        yield session
-
-    BaseModel.metadata.drop_all(bind=mock_engine)
-
-
 @pytest.fixture
 def mock_data_files():
     """Fixture to create temporary CSV files with mock data."""
@@ -140,7 +140,7 @@ def mock_data_files():
     files["companies"] = str(companies_file)
 
     contacts_file = os.path.join(tmpdir, "contacts.json")
-    pd.DataFrame(contacts_data).to_json(contacts_file, index=False)
+    pd.DataFrame(contacts_data).to_json(contacts_file, orient="records", lines=True)
     files["contacts"] = str(contacts_file)
 
     opportunities_file = os.path.join(tmpdir, "opportunities.csv")
@@ -150,30 +150,47 @@ def mock_data_files():
     activities_file = os.path.join(tmpdir, "activities.json")
     df = pd.DataFrame(activities_data)
     df["timestamp"] = df["timestamp"].astype(str)
-    df.to_json(activities_file, index=False)
+    df.to_json(activities_file, orient="records", lines=True)
     files["activities"] = str(activities_file)
 
     return files
 
 
-def add_record(new_record, file_name):
+def read_validation_errors(pipeline):
     """
-    Add a new record to the mock data file.
+    Read the validation errors logged by the pipeline's last run, by entity.
     """
-    extension = file_name.split(".")[1]
-    file = os.path.join("tests/data", file_name)
-    if extension == "csv":
-        df = pd.read_csv(file)
-    else:
-        df = pd.read_json(file)
+    validation_errors = {
+        "companies": [],
+        "contacts": [],
+        "opportunities": [],
+        "activities": [],
+    }
+    if pipeline.errors_file_path is None:
+        return validation_errors
+
+    with open(pipeline.errors_file_path) as f:
+        for line in f:
+            error = json.loads(line)
+            validation_errors[error.pop("entity")].append(error)
+    return validation_errors
 
-    # Append the new record to the DataFrame
-    modified_df = df._append(new_record, ignore_index=True)
 
-    if extension == "csv":
-        modified_df.to_csv(file, index=False)
+def add_record(new_record, file_name):
+    """
+    Append a new record to the mock data file.
+    """
+    file = os.path.join("tests/data", file_name)
+    if file_name.endswith(".csv"):
+        # Write the record's values in the order of the file's header
+        with open(file, newline="") as f:
+            header = next(csv.reader(f))
+        with open(file, "a", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow([new_record.get(column) for column in header])
     else:
-        modified_df.to_json(file, index=False)
+        with open(file, "ab") as f:
+            f.write(orjson.dumps(new_record, option=orjson.OPT_APPEND_NEWLINE))
 
 
 class TestPipeline:
@@ -217,10 +234,11 @@ class TestPipeline:
         assert len(companies) == 3  # No new companies should be added
 
         # Check that the validation errors list is empty after both runs
-        assert not pipeline.validation_errors["companies"]
-        assert not pipeline.validation_errors["contacts"]
-        assert not pipeline.validation_errors["opportunities"]
-        assert not pipeline.validation_errors["activities"]
+        validation_errors = read_validation_errors(pipeline)
+        assert not validation_errors["companies"]
+        assert not validation_errors["contacts"]
+        assert not validation_errors["opportunities"]
+        assert not validation_errors["activities"]
 
     def test_validation_errors(self, db_session, mock_data_files):
         """
@@ -275,6 +293,7 @@ class TestPipeline:
         add_record(new_opportunity, "opportunities.csv")
 
         pipeline.run()
+        validation_errors = read_validation_errors(pipeline)
 
         industry = db_session.query(Industry).filter_by(name="FINANCE").one()
         expected_response = [
@@ -295,7 +314,7 @@ class TestPipeline:
                 ],
             }
         ]
-        assert pipeline.validation_errors["companies"] == expected_response
+        assert validation_errors["companies"] == expected_response
 
         status = db_session.query(ContactStatus).filter_by(name="LEAD").one()
         expected_response = [
@@ -318,7 +337,7 @@ class TestPipeline:
                 ],
             }
         ]
-        assert pipeline.validation_errors["contacts"] == expected_response
+        assert validation_errors["contacts"] == expected_response
 
         stage_id = db_session.query(Stage.id).filter_by(name="PROSPECTING").one()[0]
         product_id = db_session.query(Product.id).filter_by(name="BASIC").one()[0]
@@ -344,4 +363,210 @@ class TestPipeline:
                 "errors": ["probability: -20 must be between 0 and 100."],
             }
         ]
-        assert pipeline.validation_errors["opportunities"] == expected_response
+        assert validation_errors["opportunities"] == expected_response
+
+    def test_duplicate_domains_are_reported(self, db_session, mock_data_files):
+        """
+        Test companies taking the domain of another company are reported,
+        rather than being skipped by the database.
+        """
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.run()
+
+        new_company = {
+            "id": "COM99999",
+            "name": "Company 3",
+            "domain": "company1.biz",
+            "industry": "Finance",
+            "size": "201-500",
+            "country": "US",
+            "created_date": "2025-01-20T10:00:00",
+            "is_customer": False,
+            "annual_revenue": 5000000,
+        }
+        add_record(new_company, "companies.csv")
+        pipeline.run()
+
+        validation_errors = read_validation_errors(pipeline)
+        assert [error["record"]["id"] for error in validation_errors["companies"]] == [
+            "COM99999"
+        ]
+        assert validation_errors["companies"][0]["errors"] == [
+            "domain: A company already exists with domain company1.biz."
+        ]
+        assert db_session.get(Company, "COM99999") is None
+
+    def test_insert_conflicts_are_reported(
+        self, db_session, mock_data_files, monkeypatch
+    ):
+        """
+        Test records skipped on insert because of a unique constraint are reported.
+        """
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.run()
+        logged_errors = []
+        monkeypatch.setattr(
+            pipeline, "log_validation_error", lambda *args: logged_errors.append(args)
+        )
+
+        company = db_session.get(Company, "COM12312").as_dict()
+        records = [
+            {**company, "id": "COM99998", "domain": "company3.com"},
+            {**company, "id": "COM99999"},
+        ]
+        pipeline.insert_records(db_session, "companies", Company, records, records)
+
+        assert logged_errors == [
+            (
+                "companies",
+                records[1],
+                ["id, domain: Conflicts with an existing record."],
+            )
+        ]
+        assert db_session.get(Company, "COM99998") is not None
+        assert db_session.get(Company, "COM99999") is None
+
+    def test_concurrent_chunks(self, db_session, mock_data_files):
+        """
+        Test the pipeline processing many chunks concurrently.
+        """
+        for i in range(3, 41):
+            add_record(
+                {
+                    "id": f"COM{i}",
+                    "name": f"Company {i}",
+                    "domain": f"company{i}.com",
+                    "industry": f"Industry {i % 7}",
+                    "size": "201-500",
+                    "country": "US",
+                    "created_date": "2024-06-15T08:45:00",
+                    "is_customer": True,
+                    "annual_revenue": 1000000,
+                },
+                "companies.csv",
+            )
+            add_record(
+                {
+                    "id": f"CONT{i}",
+                    "email": f"first{i}.last{i}@company{i}.com",
+                    "first_name": f"First{i}",
+                    "last_name": f"Last{i}",
+                    "title": "CEO",
+                    "company_id": f"COM{i}",
+                    "phone": "+1-555-123-4567",
+                    "status": f"Status {i % 5}",
+                    "created_date": "2024-06-15T08:45:00",
+                    "last_modified": "2025-01-15T14:20:00",
+                },
+                "contacts.json",
+            )
+
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.chunk_size = 3
+        pipeline.max_workers = 4
+        pipeline.run()
+        pipeline.run()
+
+        assert db_session.query(Company).count() == 40
+        assert db_session.query(Contact).count() == 40
+        assert db_session.query(Industry).count() == 9
+        assert db_session.query(ContactStatus).count() == 7
+        validation_errors = read_validation_errors(pipeline)
+        assert not any(validation_errors.values())
+
+    def test_duplicate_emails_across_chunks(self, db_session, mock_data_files):
+        """
+        Test only the newest contact of each email is inserted, when contacts
+        sharing an email are in different chunks (without the optional phone).
+        """
+        contact = {
+            "first_name": "First",
+            "last_name": "Last",
+            "title": "CEO",
+            "company_id": "COM12312",
+            "status": "Lead",
+            "created_date": "2024-06-15T08:45:00",
+        }
+        # Newer than CONT1, older than CONT2
+        add_record(
+            {
+                **contact,
+                "id": "CONT3",
+                "email": "first0.last0@company1.com",
+                "last_modified": "2025-01-16T14:20:00",
+            },
+            "contacts.json",
+        )
+        add_record(
+            {
+                **contact,
+                "id": "CONT4",
+                "email": "first1.last1@company2.com",
+                "last_modified": "2025-01-18T09:00:00",
+            },
+            "contacts.json",
+        )
+
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.chunk_size = 2
+        pipeline.run()
+
+        contact_ids = [contact.id for contact in db_session.query(Contact).all()]
+        assert sorted(contact_ids) == ["CONT2", "CONT3"]
+        assert db_session.get(Contact, "CONT3").phone is None
+        validation_errors = read_validation_errors(pipeline)
+        assert not any(validation_errors.values())
+
+    def test_frozen_now_in_chunks(self, db_session, mock_data_files):
+        """
+        Test the chunks, processed on worker threads, validate dates against
+        the "now" frozen by the caller.
+        """
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.chunk_size = 1
+        pipeline.max_workers = 2
+        with frozen_now(datetime(2024, 1, 1, tzinfo=timezone.utc)):
+            pipeline.run()
+
+        validation_errors = read_validation_errors(pipeline)
+        assert [error["record"]["id"] for error in validation_errors["companies"]] == [
+            "COM12312"
+        ]
+        assert validation_errors["companies"][0]["errors"] == [
+            "created_date: cannot be in future: 2024-06-15 08:45:00+00:00"
+        ]
+        assert db_session.get(Company, "COM12112") is not None
+
+    def test_concurrent_new_sub_entities(self, db_session, mock_data_files):
+        """
+        Test chunks adding new lookup names at the same time, each chunk maps
+        its names while the other ones update the shared cache.
+        """
+        for i in range(3, 61):
+            add_record(
+                {
+                    "id": f"COM{i}",
+                    "name": f"Company {i}",
+                    "domain": f"company{i}.com",
+                    "industry": f"Industry {i}",
+                    "size": "201-500",
+                    "country": "US",
+                    "created_date": "2024-06-15T08:45:00",
+                    "is_customer": True,
+                    "annual_revenue": 1000000,
+                },
+                "companies.csv",
+            )
+
+        pipeline = Pipeline(path="tests/data", errors_path=errors_path)
+        pipeline.chunk_size = 1
+        pipeline.max_workers = 8
+        pipeline.run()
+
+        industries = dict(db_session.query(Industry.name, Industry.id).all())
+        assert len(industries) == 60
+        for i in range(3, 61):
+            company = db_session.get(Company, f"COM{i}")
+            assert company.industry_id == industries[f"INDUSTRY {i}"]
+        assert pipeline._sub_entity_caches[Industry] == industries
+        assert not any(read_validation_errors(pipeline).values())
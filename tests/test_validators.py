@@ -0,0 +1,353 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+import validators
+
+from models import Company, Contact
+from models.validators import (
+    DOMAIN_MAX_LENGTH,
+    DOMAIN_PATTERN,
+    validate_companies_batch,
+    validate_contacts_batch,
+    validate_opportunities_batch,
+)
+from utils.etl import normalize_phone_number
+
+
+def make_companies(domains, index=None):
+    """
+    Build a companies DataFrame, with the columns used by the batch validator.
+    """
+    return pd.DataFrame(
+        {"id": [f"COMP{i}" for i in range(len(domains))], "domain": domains},
+        index=index,
+    )
+
+
+def make_contacts(rows):
+    """
+    Build a contacts DataFrame, with the columns used by the batch validator.
+    """
+    return pd.DataFrame(rows, columns=["id", "email", "phone"])
+
+
+class TestValidateCompaniesBatch:
+    """
+    Test cases for the companies batch validator.
+    """
+
+    def test_domains_match_per_record_validation(self, db_session):
+        """
+        Test the emitted errors match validating each domain with `validators.domain`.
+        """
+        domains = [
+            "company1.biz",
+            " Company2.NET ",
+            "sub.company3.co.uk",
+            "-invalid.com",
+            "invalid",
+            "invalid_domain.com",
+            "company.123",
+            "a" * 64 + ".com",
+        ]
+        companies = make_companies(domains)
+
+        cleaned_companies, errors = validate_companies_batch(db_session, companies)
+
+        for domain, cleaned_domain, domain_errors in zip(
+            domains, cleaned_companies["domain"], errors
+        ):
+            domain = domain.strip()
+            assert cleaned_domain == domain
+            if validators.domain(domain):
+                assert domain_errors == []
+            else:
+                assert domain_errors == [f"domain: {domain} is invalid."]
+
+    def test_domain_pattern_fast_path(self, db_session):
+        """
+        Test domains accepted by the vectorized pattern are valid for
+        `validators.domain`, and the other ones go through it.
+        """
+        fast_path_domains = [
+            "company1.biz",
+            "COMPANY.COM",
+            "xn--bcher-kva.de",
+            "exa--mple.com",
+            "a" * 63 + ".com",
+        ]
+        for domain in fast_path_domains:
+            assert re.fullmatch(DOMAIN_PATTERN, domain, re.IGNORECASE)
+            assert validators.domain(domain) is True
+
+        # Internationalized domains don't match the pattern but are valid,
+        # too long domains match it but aren't
+        fallback_domains = ["bücher.de", "münchen.com", "a." * 130 + "com"]
+        assert len(fallback_domains[-1]) > DOMAIN_MAX_LENGTH
+        companies = make_companies(fast_path_domains + fallback_domains)
+
+        _, errors = validate_companies_batch(db_session, companies)
+
+        assert errors == [
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [f"domain: {'a.' * 130}com is invalid."],
+        ]
+
+    def test_missing_domains_are_skipped(self, db_session):
+        """
+        Test missing domains are left to the model's not-null validation.
+        """
+        companies = make_companies([None, "company1.biz"], index=[10, 20])
+
+        cleaned_companies, errors = validate_companies_batch(db_session, companies)
+
+        assert cleaned_companies.index.tolist() == [10, 20]
+        assert cleaned_companies["domain"].tolist() == [None, "company1.biz"]
+        assert errors == [[], []]
+
+    def test_taken_domains(self, db_session):
+        """
+        Test domains already taken by other companies, in the database or
+        earlier in the batch.
+        """
+        db_session.add(
+            Company(
+                id="COMP0",
+                industry_id=1,
+                name="COMPANY 0",
+                domain="taken.com",
+                size="1-10",
+                country="US",
+                created_date=datetime(2024, 6, 15),
+                is_customer=True,
+                annual_revenue=1000,
+            )
+        )
+        db_session.commit()
+        companies = make_companies(
+            ["taken.com", "company1.biz", "company1.biz", "company3.net"]
+        )
+
+        _, errors = validate_companies_batch(db_session, companies)
+
+        assert errors == [
+            # Re-processed companies keep their own domain
+            [],
+            [],
+            ["domain: A company already exists with domain company1.biz."],
+            [],
+        ]
+        companies["id"] = ["COMP9", "COMP1", "COMP2", "COMP3"]
+
+        _, errors = validate_companies_batch(db_session, companies)
+
+        assert errors[0] == ["domain: A company already exists with domain taken.com."]
+
+    def test_malformed_flags_and_revenues(self, db_session):
+        """
+        Test string `is_customer` and `annual_revenue` columns (read from CSV
+        chunks holding malformed values) are converted, or reported.
+        """
+        companies = make_companies(["company1.biz", "company2.biz", "company3.biz"])
+        companies["is_customer"] = pd.Series(
+            ["True", " false ", "maybe"], dtype="string[pyarrow]"
+        )
+        companies["annual_revenue"] = pd.Series(
+            ["1000", "1e3", "abc"], dtype="string[pyarrow]"
+        )
+
+        cleaned_companies, errors = validate_companies_batch(db_session, companies)
+
+        assert cleaned_companies["is_customer"].tolist() == [True, False, pd.NA]
+        assert cleaned_companies["annual_revenue"].tolist() == [1000.0, 1000.0, pd.NA]
+        assert errors == [
+            [],
+            [],
+            [
+                "is_customer: maybe must be a valid boolean.",
+                "annual_revenue: abc must be a valid numeric value.",
+            ],
+        ]
+
+
+class TestValidateContactsBatch:
+    """
+    Test cases for the contacts batch validator.
+    """
+
+    def test_emails(self, db_session):
+        """
+        Test email format errors and emails already taken by other contacts.
+        """
+        db_session.add(
+            Contact(
+                id="CONT1",
+                email="taken@company1.com",
+                first_name="First",
+                last_name="Last",
+                title="CEO",
+                status_id=1,
+                company_id="COMP1",
+                created_date=datetime(2024, 6, 15),
+                last_modified=datetime(2024, 6, 15),
+            )
+        )
+        db_session.commit()
+        contacts = make_contacts(
+            [
+                ("CONT2", " first.last@company2.com ", None),
+                ("CONT3", "invalid_email", None),
+                ("CONT4", "taken@company1.com", None),
+                # Re-processed contacts keep their own email
+                ("CONT1", "taken@company1.com", None),
+                ("CONT5", None, None),
+            ]
+        )
+
+        cleaned_contacts, errors = validate_contacts_batch(db_session, contacts)
+
+        assert cleaned_contacts["email"].tolist() == [
+            "first.last@company2.com",
+            "invalid_email",
+            "taken@company1.com",
+            "taken@company1.com",
+            None,
+        ]
+        assert errors == [
+            [],
+            ["email: invalid_email is not a valid email address."],
+            ["email: A contact already exists with email taken@company1.com."],
+            [],
+            [],
+        ]
+
+    def test_phones(self, db_session):
+        """
+        Test phone numbers are normalized to international format, or reported.
+        """
+        contacts = make_contacts(
+            [
+                ("CONT1", None, " +1-555-123-4567 "),
+                ("CONT2", None, "11231231234"),
+                ("CONT3", None, "+999 123"),
+                ("CONT4", None, None),
+            ]
+        )
+
+        cleaned_contacts, errors = validate_contacts_batch(db_session, contacts)
+
+        normalized_phone, is_normalized = normalize_phone_number(
+            "+1-555-123-4567", None
+        )
+        assert is_normalized
+        assert cleaned_contacts["phone"].tolist() == [
+            normalized_phone,
+            "11231231234",
+            "+999 123",
+            None,
+        ]
+        assert errors == [
+            [],
+            [
+                "phone: 11231231234 is not a valid. "
+                "Please provide a valid phone number in international format."
+            ],
+            [
+                "phone: +999 123 is not a valid. "
+                "Please provide a valid phone number in international format."
+            ],
+            [],
+        ]
+
+
+class TestValidateOpportunitiesBatch:
+    """
+    Test cases for the opportunities batch validator.
+    """
+
+    def test_numeric_values(self):
+        """
+        Test numeric probabilities are truncated like `int()` and range checked.
+        """
+        opportunities = pd.DataFrame(
+            {
+                "probability": [15.7, -0.5, 150, float("inf"), 1e30, None],
+                "amount": [25000, -3, 0.5, 1, 1, None],
+            }
+        )
+
+        cleaned_opportunities, errors = validate_opportunities_batch(opportunities)
+
+        assert cleaned_opportunities["probability"].tolist() == [
+            15,
+            0,
+            150.0,
+            float("inf"),
+            1e30,
+            pd.NA,
+        ]
+        assert cleaned_opportunities["amount"].tolist() == [
+            25000.0,
+            -3.0,
+            0.5,
+            1.0,
+            1.0,
+            pd.NA,
+        ]
+        assert errors == [
+            [],
+            ["amount: -3.0 cannot be negative."],
+            ["probability: 150.0 must be between 0 and 100."],
+            ["probability: inf must be between 0 and 100."],
+            ["probability: 1e+30 must be between 0 and 100."],
+            [],
+        ]
+
+    def test_string_values(self):
+        """
+        Test string values are parsed, decimal strings aren't valid probabilities.
+        String `is_closed` values are parsed like PyArrow's CSV reader.
+        """
+        opportunities = pd.DataFrame(
+            {
+                "probability": ["15", "3.5", "x", "inf", "-20", None],
+                "amount": ["1.5", "-2", "y", "10", "10", None],
+                "is_closed": ["TRUE", "0", "z", "false", "1", None],
+            },
+            dtype="string[pyarrow]",
+        )
+
+        cleaned_opportunities, errors = validate_opportunities_batch(opportunities)
+
+        assert cleaned_opportunities["probability"].tolist()[:1] == [15]
+        assert cleaned_opportunities["amount"].tolist()[:1] == [1.5]
+        assert cleaned_opportunities["is_closed"].tolist() == [
+            True,
+            False,
+            pd.NA,
+            False,
+            True,
+            pd.NA,
+        ]
+        assert errors == [
+            [],
+            [
+                "probability: 3.5 must be a valid integer.",
+                "amount: -2.0 cannot be negative.",
+            ],
+            [
+                "probability: x must be a valid integer.",
+                "amount: y must be a valid numeric value.",
+                "is_closed: z must be a valid boolean.",
+            ],
+            ["probability: inf must be a valid integer."],
+            ["probability: -20 must be between 0 and 100."],
+            [],
+        ]
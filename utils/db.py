@@ -1,8 +1,11 @@
 import logging
 import os
 from contextlib import contextmanager
+from functools import cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import any_, bindparam, create_engine, event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -12,52 +15,182 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data.db")
-engine = create_engine(DATABASE_URL)
+
+# Applied on each SQLite connection: write-ahead logging lets commits skip
+# the rollback journal fsync, which dominates bulk inserts
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+)
+
+# Seconds a SQLite connection waits for another one to release its write lock
+SQLITE_BUSY_TIMEOUT = 60
+
+# Number of values bound per `IN` query, below SQLite's historical
+# limit of 999 bound parameters per statement
+IN_BATCH_SIZE = 900
+
+
+def get_engine_options(database_url):
+    """
+    Returns `create_engine` options, including driver specific ones.
+    """
+    # Rows per multi-row INSERT ... VALUES statement rendered by SQLAlchemy
+    # for executemany() (INSERT ... RETURNING, PostgreSQL drivers)
+    options = {"insertmanyvalues_page_size": 1000}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"timeout": SQLITE_BUSY_TIMEOUT}
+    if url.get_backend_name() == "postgresql":
+        # Room for the pipeline's concurrent chunk sessions
+        options.update(pool_size=25, max_overflow=25, pool_pre_ping=True)
+    if url.get_driver_name() == "psycopg2":
+        # Render executemany() as multi-row INSERT ... VALUES batches
+        options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Applies `SQLITE_PRAGMAS` to a new SQLite connection.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 Session = sessionmaker(bind=engine)
 
 
 class BaseModel(Base):
     __abstract__ = True
 
+    # Only set on instances with unknown columns, reported by `validate`
+    _unknown_columns = frozenset()
+
     def __init__(self, **kwargs):
-        self.validation_errors = []
-        # Report unknown columns into validation errors
-        unknown_columns = set(kwargs.keys()) - set([c.name for c in self.columns])
+        column_names = self._column_names()
+        unknown_columns = kwargs.keys() - column_names
         if unknown_columns:
-            self.validation_errors.append(
-                f"Unknown columns: {', '.join(unknown_columns)}"
-            )
+            self._unknown_columns = unknown_columns
 
-        # Drop unknown columns
-        for col in unknown_columns:
-            kwargs.pop(col)
+            # Drop unknown columns
+            kwargs = {k: v for k, v in kwargs.items() if k in column_names}
 
         super().__init__(**kwargs)
 
+    @classmethod
+    @cache
+    def _validation_plan(cls):
+        """
+        Returns `(column name, nullable, validate_<column> function or None)`
+        for each column of the model, computed once per model class.
+        """
+        plan = []
+        for column in cls.__table__.columns:
+            validator = getattr(cls, f"validate_{column.name}", None)
+            if not callable(validator):
+                validator = None
+            plan.append((column.name, column.nullable, validator))
+        return tuple(plan)
+
+    @classmethod
+    @cache
+    def _columns(cls):
+        return tuple(cls.__table__.columns)
+
+    @classmethod
+    @cache
+    def _column_names(cls):
+        return frozenset(column.name for column in cls.__table__.columns)
+
     def validate(self):
-        for column in self.columns:
-            value = getattr(self, column.name)
+        """
+        Validates the instance's columns, setting their validated values.
+
+        Returns:
+            list: The validation errors of the instance, empty if it is valid.
+        """
+        errors = []
+        if self._unknown_columns:
+            errors.append(f"Unknown columns: {', '.join(self._unknown_columns)}")
+
+        for name, nullable, validator in self._validation_plan():
+            value = getattr(self, name)
             try:
-                if not column.nullable and value is None:
-                    raise ValueError(f"{column.name} cannot be null.")
-
-                if hasattr(self, f"validate_{column.name}"):
-                    validator = getattr(self, f"validate_{column.name}")
-                    if callable(validator):
-                        value = validator(column.name, value)
-                        setattr(self, column.name, value)
+                if not nullable and value is None:
+                    raise ValueError(f"{name} cannot be null.")
+
+                if validator is not None:
+                    value = validator(self, name, value)
+                    setattr(self, name, value)
             except ValueError as e:
-                self.validation_errors.append(str(e))
+                errors.append(str(e))
                 continue
 
-        return not self.validation_errors
+        return errors
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return {c.name: getattr(self, c.name) for c in self.columns}
 
     @property
     def columns(self):
-        return [c for c in self.__table__.columns]
+        return self._columns()
+
+
+def insert_ignore_conflicts(session, model):
+    """
+    Returns an INSERT statement for `model` which skips rows violating any
+    primary key / unique constraint (i.e. `INSERT ... ON CONFLICT DO NOTHING`).
+
+    Backends without `ON CONFLICT` support get a plain INSERT, conflicting
+    rows have to be filtered out beforehand.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        model (class): SQLAlchemy model class.
+    """
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect_name == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+
+    return insert(model)
+
+
+def select_where_in(session, columns, column, values):
+    """
+    Yields the `columns` of the rows whose `column` is one of `values`.
+
+    On PostgreSQL, values are bound as a single array parameter
+    (`column = ANY(:values)`) and rows are streamed. Other backends run
+    `IN` queries on batches of `IN_BATCH_SIZE` values.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        columns (list): Model columns to be selected.
+        column (Column): Model column to be filtered on.
+        values (list): Values to be looked up.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        values = bindparam("values", values, type_=postgresql.ARRAY(column.type))
+        yield from session.execute(
+            select(*columns).where(column == any_(values)),
+            execution_options={"yield_per": 10000},
+        )
+        return
+
+    for start in range(0, len(values), IN_BATCH_SIZE):
+        yield from session.execute(
+            select(*columns).where(column.in_(values[start : start + IN_BATCH_SIZE]))
+        )
 
 
 @contextmanager
@@ -1,24 +1,163 @@
-from datetime import timezone
+import csv
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 
+import ciso8601
+import orjson
 import pandas as pd
-import phonenumbers
+import pyarrow as pa
 from dateutil import parser
+from pyarrow import csv as pa_csv
 
-DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+# Types tried in order for each column of a CSV chunk, see `read_csv_chunks`
+CSV_COLUMN_TYPES = (pa.int64(), pa.float64(), pa.bool_())
 
+# "Now" snapshot of the batch being validated, see `frozen_now`
+_frozen_now: ContextVar = ContextVar("frozen_now", default=None)
 
-def clean_text(text, lower=False):
+
+def clean_text_column(column, lower=False):
+    """
+    Clean and standardize a column of text: stripped and upper (or lower) cased.
+    """
+    column = strip_text_column(column)
+    return column.str.lower() if lower else column.str.upper()
+
+
+def strip_text_column(column):
+    """
+    Strip a column of text, as pandas' `string` dtype.
+    """
+    return column.astype("string").str.strip()
+
+
+def title_text_column(column):
+    """
+    Strip and title-case a column of text, as pandas' `string` dtype.
+    """
+    return strip_text_column(column).str.title()
+
+
+def iter_records(df):
+    """
+    Iterate over DataFrame rows as dictionaries.
+
+    Unlike `df.to_dict(orient="records")`, column values are read once as
+    native Python lists and records are built lazily, so the whole DataFrame
+    is not materialized as dictionaries at once.
+    """
+    columns = df.columns.tolist()
+    values = [
+        df[column].to_numpy(dtype=object, na_value=None).tolist() for column in columns
+    ]
+    for row in zip(*values):
+        yield dict(zip(columns, row))
+
+
+def read_csv_chunks(file_path, chunk_size, block_size=64 << 20, string_columns=()):
+    """
+    Stream a CSV file as DataFrame chunks of at most `chunk_size` rows.
+
+    The file is parsed by PyArrow's multithreaded CSV reader in blocks of
+    `block_size` bytes, each block is then sliced (zero-copy) into chunks.
+
+    All the columns are read as strings, then the type of each column is
+    inferred per chunk (see `CSV_COLUMN_TYPES`). A malformed value (e.g. a
+    non-numeric amount) keeps its chunk's column as strings, to be reported
+    by the validators, rather than failing the whole file. Columns listed in
+    `string_columns` (e.g. dates which are validated later on) are always kept
+    as strings to keep their raw values.
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        column_names = next(csv.reader(f), [])
+
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in column_names},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        for offset in range(0, batch.num_rows, chunk_size):
+            chunk = batch.slice(offset, chunk_size)
+            columns = [
+                column if name in string_columns else infer_column_type(column)
+                for name, column in zip(chunk.schema.names, chunk.columns)
+            ]
+            chunk = pa.RecordBatch.from_arrays(columns, names=chunk.schema.names)
+            yield chunk.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def infer_column_type(column):
+    """
+    Cast a column of strings to the first of `CSV_COLUMN_TYPES` all its
+    values can be parsed as, or keep it as strings.
+    """
+    for column_type in CSV_COLUMN_TYPES:
+        try:
+            return column.cast(column_type)
+        except pa.ArrowInvalid:
+            continue
+    return column
+
+
+def read_json_chunks(file_path, chunk_size, columns=()):
     """
-    Clean and standardize text.
+    Stream a NDJSON (i.e. newline-delimited JSON) file as DataFrame chunks
+    of at most `chunk_size` rows.
+
+    Lines are parsed by `orjson` (native code) and each chunk of records is
+    loaded into a DataFrame at once. Values are kept as parsed, dates are
+    validated later on.
+
+    Any of `columns` missing from all the records of a chunk (e.g. an
+    optional key) is added with missing values.
+    """
+    with open(file_path, "rb") as f:
+        while lines := list(islice(f, chunk_size)):
+            records = [orjson.loads(line) for line in lines if not line.isspace()]
+            if records:
+                df = pd.DataFrame(records)
+                missing_columns = [c for c in columns if c not in df.columns]
+                yield df.assign(**dict.fromkeys(missing_columns))
+
+
+def parse_datetime_columns(df, columns):
     """
-    if text is not None:
-        text = text.strip()
-        return text.lower() if lower else text.upper()
+    Parses ISO 8601 datetime columns in a single vectorized pass each.
+
+    Values which can't be parsed this way are kept as is, for the models'
+    validators to parse (e.g. other formats) or report them.
+
+    Args:
+        df (DataFrame): Pandas DataFrame containing the datetime columns.
+        columns (Iterable[str]): Names of the datetime columns.
+
+    Returns:
+        DataFrame: The parsed columns (UTC timestamps or raw values).
+    """
+    parsed_columns = {}
+    for column in columns:
+        timestamps = pd.to_datetime(
+            df[column], format="ISO8601", utc=True, errors="coerce", cache=True
+        )
+        parsed_columns[column] = timestamps.astype(object).where(
+            timestamps.notna(), df[column].astype(object)
+        )
+    return pd.DataFrame(parsed_columns, index=df.index)
 
 
 def standardize_datetime(datetime_str):
     """
     Parses any datetime format and add timezone info.
+
+    ISO 8601 strings are parsed by `ciso8601` (C extension), other formats fall
+    back to `dateutil`. Parsed strings are cached as rows share many values.
     """
 
     if isinstance(datetime_str, pd.Timestamp):
@@ -27,7 +166,16 @@ def standardize_datetime(datetime_str):
             return datetime_str.tz_localize("UTC")
         return datetime_str
 
-    parsed_dt = parser.parse(datetime_str)
+    return _parse_datetime(datetime_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(datetime_str):
+    try:
+        parsed_dt = ciso8601.parse_datetime(datetime_str)
+    except ValueError:
+        parsed_dt = parser.parse(datetime_str)
+
     # Ensure timezone info is included; assume UTC if none is present
     if parsed_dt.tzinfo is None:
         parsed_dt = parsed_dt.replace(tzinfo=timezone.utc)
@@ -35,6 +183,34 @@ def standardize_datetime(datetime_str):
     return parsed_dt
 
 
+def utc_now():
+    """
+    Returns the current UTC datetime, or the snapshot taken by the enclosing
+    `frozen_now` block.
+    """
+    now = _frozen_now.get()
+    return now if now is not None else datetime.now(tz=timezone.utc)
+
+
+@contextmanager
+def frozen_now(now=None):
+    """
+    Freezes `utc_now` to a single snapshot, so validating a batch of records
+    doesn't read the clock once per record.
+
+    Args:
+        now (datetime): The snapshot to use, the current UTC datetime if None.
+    """
+    if now is None:
+        now = datetime.now(tz=timezone.utc)
+    token = _frozen_now.set(now)
+    try:
+        yield
+    finally:
+        _frozen_now.reset(token)
+
+
+@lru_cache(maxsize=65536)
 def normalize_phone_number(phone_number, region):
     """
     Normalize phone number to international format.
@@ -53,7 +229,11 @@ def normalize_phone_number(phone_number, region):
     Returns:
         An international formatted phone number if normalized successfully and a boolean
         indicating whether the phone number was successfully parsed or not.
+
+    Results are cached by `(phone_number, region)`.
     """
+    import phonenumbers
+
     try:
         parsed_phone_number = phonenumbers.parse(phone_number, region)
         phone_number_format = phonenumbers.PhoneNumberFormat.INTERNATIONAL
@@ -61,5 +241,5 @@ def normalize_phone_number(phone_number, region):
             parsed_phone_number, phone_number_format
         )
         return formatted_phone_number, True
-    except Exception:
+    except phonenumbers.NumberParseException:
         return phone_number, False